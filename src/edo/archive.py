@@ -0,0 +1,144 @@
+""" An archive of all of the individuals in a generation. """
+
+import pickle
+from pathlib import Path
+
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+
+from .individual import Individual, load_metadata
+
+DATA_FILENAME = "population.data"
+META_FILENAME = "population.meta"
+
+
+def write_generation(population, path):
+    """Write every individual in ``population`` to one data file and one
+    metadata file in ``path``. The columns of the individuals are written end
+    to end as raw arrays. The metadata file holds a record for each
+    individual with the offset at which its columns start in the data file,
+    its number of rows and the datatypes of its columns, along with its
+    distributions and PRNG."""
+
+    path = Path(path)
+    path.mkdir(exist_ok=True, parents=True)
+
+    records = []
+    with open(path / DATA_FILENAME, "wb") as data:
+        for individual in population:
+            columns = individual.columns
+            nrows = len(columns[0]) if columns else len(individual.dataframe)
+            records.append(
+                {
+                    "offset": data.tell(),
+                    "nrows": nrows,
+                    "dtypes": [column.dtype.str for column in columns],
+                    "metadata": [pdf.to_dict() for pdf in individual.metadata],
+                    "random_state": individual.random_state,
+                }
+            )
+
+            for column in columns:
+                data.write(np.ascontiguousarray(column).tobytes())
+
+    with open(path / META_FILENAME, "wb") as meta:
+        pickle.dump(records, meta, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def is_archive(path):
+    """ Determine whether there is a generation archive at ``path``. """
+
+    return (Path(path) / META_FILENAME).exists()
+
+
+def read_records(path):
+    """ Read the record of each individual in the archive at ``path``. """
+
+    with open(Path(path) / META_FILENAME, "rb") as meta:
+        return pickle.load(meta)
+
+
+def read_individual(
+    path,
+    idx,
+    distributions,
+    family_root=".edocache",
+    method="pandas",
+    records=None,
+    families=None,
+):
+    """Create the individual at position ``idx`` of the generation archived at
+    ``path``. Its columns are read with a single seek into the data file
+    rather than by finding its own files. The records of the archive and the
+    families of its distributions can be passed in when reading several
+    individuals from it so that they are only read once.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the archive.
+    idx : int
+        The position of the individual in its generation.
+    distributions : list
+        The distribution classes used in the run.
+    family_root : str, optional
+        The directory in which the families were saved.
+    method : str, optional
+        Either ``"pandas"`` or ``"dask"``, determining the type of the
+        dataframe of the individual.
+    records : list, optional
+        The records of the archive as given by ``read_records``.
+    families : dict, optional
+        A dictionary of the families that have been loaded so far, keyed by
+        the name of their distribution.
+
+    Returns
+    -------
+    individual : Individual
+        The recovered individual.
+    """
+
+    path = Path(path)
+    if records is None:
+        records = read_records(path)
+
+    record = records[idx]
+    nrows = record["nrows"]
+    dtypes = [np.dtype(dtype) for dtype in record["dtypes"]]
+
+    with open(path / DATA_FILENAME, "rb") as data:
+        data.seek(record["offset"])
+        buffer = data.read(nrows * sum(dtype.itemsize for dtype in dtypes))
+
+    columns, offset = {}, 0
+    for j, dtype in enumerate(dtypes):
+        columns[j] = np.frombuffer(buffer, dtype, count=nrows, offset=offset)
+        offset += nrows * dtype.itemsize
+
+    dataframe = pd.DataFrame(columns, index=pd.RangeIndex(nrows))
+    if method == "dask":
+        dataframe = dd.from_pandas(dataframe, npartitions=1)
+
+    distributions = {dist.name: dist for dist in distributions}
+    metadata = load_metadata(
+        record["metadata"], distributions, family_root, families
+    )
+
+    return Individual(dataframe, metadata, record["random_state"])
+
+
+def read_generation(
+    path, distributions, family_root=".edocache", method="pandas"
+):
+    """Create every individual in the generation archived at ``path``, in
+    order. The records and families are read once for the whole
+    generation."""
+
+    records, families = read_records(path), {}
+    return [
+        read_individual(
+            path, idx, distributions, family_root, method, records, families
+        )
+        for idx in range(len(records))
+    ]
@@ -1,12 +1,159 @@
 """ The base class from which all distributions inherit. """
 
 import abc
+import inspect
+from functools import lru_cache
+
+import numpy as np
+
+SUBTYPE_ATTRIBUTES = ("family", "subtype_id", "param_limits", "dtype")
+BUFFER_ATTRIBUTES = ("_buffer", "_buffer_state", "_buffer_position")
 
 
 class Distribution(metaclass=abc.ABCMeta):
     """An abstract base class for all currently implemented distributions and
-    those defined by users."""
+    those defined by users.
+
+    Attributes
+    ----------
+    buffer_size : int
+        The number of values that an instance samples at once to serve small
+        requests made with ``draw``. If ``None``, as is the default, every
+        request is sampled as it is made.
+    family : edo.Family
+        The family of the subtype that created the instance, if any. This is
+        left out when the instance is pickled, so that the family's PRNG and
+        subtypes are not pickled with it. A pickled instance keeps its
+        ``subtype_id`` but has no family.
+    """
+
+    buffer_size = None
+    family = None
+
+    def __getstate__(self):
+
+        return {
+            name: value
+            for name, value in vars(self).items()
+            if name not in ("family",) + BUFFER_ATTRIBUTES
+        }
+
+    def get_params(self):
+        """Get the parameters of the instance, leaving out the attributes given
+        to it by the subtype that created it and any buffered values."""
+
+        return {
+            name: value
+            for name, value in vars(self).items()
+            if name not in SUBTYPE_ATTRIBUTES + BUFFER_ATTRIBUTES
+        }
+
+    def draw(self, random_state, size=None):
+        """Draw a single value from the distribution, or an array of ``size``
+        values. If ``buffer_size`` is set then requests of up to that many
+        values are served from a block of values sampled with
+        ``random_state``. The block is sampled afresh when it runs out or
+        when a different PRNG is used, so the values only depend on the PRNG
+        that asks for them. Otherwise, the values are sampled directly."""
+
+        nvalues = 1 if size is None else size
+        if self.buffer_size is None or nvalues > self.buffer_size:
+            values = self.sample(nvalues, random_state)
+        else:
+            values = self._take_buffered(nvalues, random_state)
+
+        return values[0] if size is None else values
+
+    def _take_buffered(self, nvalues, random_state):
+        """ Take the next ``nvalues`` values from the buffer. """
+
+        position = getattr(self, "_buffer_position", 0)
+        if (
+            getattr(self, "_buffer_state", None) is not random_state
+            or position + nvalues > len(self._buffer)
+        ):
+            self._buffer = self.sample(self.buffer_size, random_state)
+            self._buffer_state = random_state
+            position = 0
+
+        end = position + nvalues
+        self._buffer_position = end
+
+        return self._buffer[position:end]
+
+    def to_dict(self):
+        """Convert the instance to a dictionary so it can be recovered at a
+        later date."""
+
+        return {
+            "name": self.name,
+            "subtype_id": self.subtype_id,
+            "params": self.get_params(),
+        }
+
+    @classmethod
+    def get_value_limits(cls, param_limits):
+        """Get the lower and upper limits on the values that the distribution
+        can take when its parameters are within ``param_limits``. These are
+        used to choose a compact datatype for its columns. Return ``None`` if
+        there are no such limits, as is the default."""
+
+        return None
 
     @abc.abstractmethod
-    def sample(self, nrows=None, random_state=None):
-        """ A placeholder function for sampling from the distribution. """
+    def sample(self, nrows=None, random_state=None, out=None):
+        """A placeholder function for sampling from the distribution. If
+        ``out`` is given, the sample should be written into it and ``out``
+        returned rather than a new array."""
+
+
+def sample_into(pdf, nrows, random_state, out=None):
+    """Take a sample of size ``nrows`` from ``pdf``, writing it into ``out``
+    if it is given. Distributions whose ``sample`` method does not take
+    ``out``, such as those defined by users, have their sample copied into
+    ``out`` instead."""
+
+    if out is None:
+        return pdf.sample(nrows, random_state)
+
+    if _takes_out(type(pdf)):
+        return pdf.sample(nrows, random_state, out=out)
+
+    out[...] = pdf.sample(nrows, random_state)
+    return out
+
+
+def write_out(values, out=None):
+    """Return ``values`` as they are, or copy them into ``out`` and return
+    that instead if it is given."""
+
+    if out is None:
+        return values
+
+    out[...] = values
+    return out
+
+
+def fills_out(random_state, out):
+    """Determine whether ``random_state`` can sample directly into ``out``.
+    Only a ``numpy.random.Generator`` can, and then only into a writeable,
+    contiguous array of single- or double-precision floats."""
+
+    return (
+        out is not None
+        and isinstance(random_state, np.random.Generator)
+        and out.dtype in (np.float32, np.float64)
+        and out.flags.c_contiguous
+        and out.flags.writeable
+    )
+
+
+@lru_cache(maxsize=None)
+def _takes_out(distribution):
+    """ Determine whether the ``sample`` method of a class takes ``out``. """
+
+    parameters = inspect.signature(distribution.sample).parameters.values()
+    return any(
+        param.name == "out" or param.kind is param.VAR_KEYWORD
+        for param in parameters
+    )
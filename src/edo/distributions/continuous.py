@@ -1,6 +1,6 @@
 """ All currently implemented continuous distributions. """
 
-from .base import Distribution
+from .base import Distribution, fills_out, write_out
 
 
 class Gamma(Distribution):
@@ -8,7 +8,7 @@ class Gamma(Distribution):
 
     Parameters
     ----------
-    random_state : numpy.random.RandomState
+    random_state : numpy.random.Generator or numpy.random.RandomState
         The PRNG used to sample instance parameters from ``param_limits``.
 
     Attributes
@@ -44,13 +44,21 @@ class Gamma(Distribution):
         theta = round(self.theta, 2)
         return f"Gamma(alpha={alpha}, theta={theta})"
 
-    def sample(self, nrows, random_state):
+    def sample(self, nrows, random_state, out=None):
         """Take a sample of size ``nrows`` from the gamma distribution using
-        the provided ``np.random.RandomState`` instance."""
+        the provided PRNG. If given, the sample is written into ``out``, which
+        should have ``nrows`` elements."""
 
-        return random_state.gamma(
-            shape=self.alpha, scale=self.theta, size=nrows
-        )
+        if not fills_out(random_state, out):
+            values = random_state.gamma(
+                shape=self.alpha, scale=self.theta, size=nrows
+            )
+            return write_out(values, out)
+
+        random_state.standard_gamma(self.alpha, dtype=out.dtype, out=out)
+        out *= self.theta
+
+        return out
 
 
 class Normal(Distribution):
@@ -58,7 +66,7 @@ class Normal(Distribution):
 
     Parameters
     ----------
-    random_state : numpy.random.RandomState
+    random_state : numpy.random.Generator or numpy.random.RandomState
         The PRNG used to sample instance parameters from ``param_limits``.
 
     Attributes
@@ -93,11 +101,22 @@ class Normal(Distribution):
         std = round(self.std, 2)
         return f"Normal(mean={mean}, std={std})"
 
-    def sample(self, nrows, random_state):
+    def sample(self, nrows, random_state, out=None):
         """Take a sample of size ``nrows`` from the normal distribution using
-        the provided ``np.random.RandomState`` instance."""
+        the provided PRNG. If given, the sample is written into ``out``, which
+        should have ``nrows`` elements."""
+
+        if not fills_out(random_state, out):
+            values = random_state.normal(
+                loc=self.mean, scale=self.std, size=nrows
+            )
+            return write_out(values, out)
 
-        return random_state.normal(loc=self.mean, scale=self.std, size=nrows)
+        random_state.standard_normal(dtype=out.dtype, out=out)
+        out *= self.std
+        out += self.mean
+
+        return out
 
 
 class Uniform(Distribution):
@@ -105,7 +124,7 @@ class Uniform(Distribution):
 
     Parameters
     ----------
-    random_state : numpy.random.RandomState
+    random_state : numpy.random.Generator or numpy.random.RandomState
         The PRNG used to sample instance parameters from ``param_limits``.
 
     Attributes
@@ -138,8 +157,18 @@ class Uniform(Distribution):
         upper = round(max(self.bounds), 2)
         return f"Uniform(bounds=[{lower}, {upper}])"
 
-    def sample(self, nrows, random_state):
+    def sample(self, nrows, random_state, out=None):
         """Take a sample of size ``nrows`` from the uniform distribution using
-        the provided ``np.random.RandomState`` instance."""
+        the provided PRNG. If given, the sample is written into ``out``, which
+        should have ``nrows`` elements."""
+
+        if not fills_out(random_state, out):
+            values = random_state.uniform(*self.bounds, size=nrows)
+            return write_out(values, out)
+
+        lower, upper = self.bounds
+        random_state.random(dtype=out.dtype, out=out)
+        out *= upper - lower
+        out += lower
 
-        return random_state.uniform(*self.bounds, size=nrows)
+        return out
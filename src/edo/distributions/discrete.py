@@ -1,6 +1,8 @@
 """ All currently implemented discrete distribution classes. """
 
-from .base import Distribution
+import numpy as np
+
+from .base import Distribution, write_out
 
 
 class Bernoulli(Distribution):
@@ -9,7 +11,7 @@ class Bernoulli(Distribution):
 
     Parameters
     ----------
-    random_state : numpy.random.RandomState
+    random_state : numpy.random.Generator or numpy.random.RandomState
         The PRNG used to sample instance parameters from ``param_limits``.
 
     Attributes
@@ -39,11 +41,19 @@ class Bernoulli(Distribution):
 
         return f"Bernoulli(prob={round(self.prob, 2)})"
 
-    def sample(self, nrows, random_state):
+    @classmethod
+    def get_value_limits(cls, param_limits):
+        """ A Bernoulli variable is either zero or one. """
+
+        return 0, 1
+
+    def sample(self, nrows, random_state, out=None):
         """Take a sample of size ``nrows`` from the Bernoulli distribution
-        using the provided ``np.random.RandomState`` instance."""
+        using the provided PRNG. If given, the sample is written into ``out``,
+        which should have ``nrows`` elements."""
 
-        return random_state.binomial(n=1, p=self.prob, size=nrows)
+        values = random_state.binomial(n=1, p=self.prob, size=nrows)
+        return write_out(values, out)
 
 
 class Poisson(Distribution):
@@ -51,7 +61,7 @@ class Poisson(Distribution):
 
     Parameters
     ----------
-    random_state : numpy.random.RandomState
+    random_state : numpy.random.Generator or numpy.random.RandomState
         The PRNG used to sample instance parameters from ``param_limits``.
 
     Attributes
@@ -81,8 +91,20 @@ class Poisson(Distribution):
 
         return f"Poisson(lam={round(self.lam, 2)})"
 
-    def sample(self, nrows, random_state):
+    @classmethod
+    def get_value_limits(cls, param_limits):
+        """Get limits on the values of the distribution from the largest rate
+        in ``param_limits``. The upper limit is twenty standard deviations and
+        twenty more above that rate, which a sample exceeds with negligible
+        probability."""
+
+        lam = max(param_limits["lam"])
+        return 0, int(np.ceil(lam + 20 * np.sqrt(lam) + 20))
+
+    def sample(self, nrows, random_state, out=None):
         """Take a sample of size ``nrows`` from the Poisson distribution
-        using the provided ``np.random.RandomState`` instance."""
+        using the provided PRNG. If given, the sample is written into ``out``,
+        which should have ``nrows`` elements."""
 
-        return random_state.poisson(lam=self.lam, size=nrows)
+        values = random_state.poisson(lam=self.lam, size=nrows)
+        return write_out(values, out)
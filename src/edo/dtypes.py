@@ -0,0 +1,64 @@
+""" Policies for choosing the datatype of each generated column. """
+
+import numpy as np
+
+INTEGER_DTYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def get_dtype(distribution, param_limits, policy="default"):
+    """Get the datatype of the columns sampled from ``distribution`` with
+    ``param_limits`` under ``policy``. This is either the name of a policy in
+    ``DTYPE_POLICIES`` or a function with the same signature as those
+    policies. An unknown name raises a ``ValueError``."""
+
+    if isinstance(policy, str) and policy not in DTYPE_POLICIES:
+        raise ValueError(
+            f"Unknown datatype policy {policy!r}. Use one of "
+            f"{sorted(DTYPE_POLICIES)} or a function."
+        )
+
+    policy = DTYPE_POLICIES.get(policy, policy)
+    return np.dtype(policy(distribution, param_limits))
+
+
+def default(distribution, param_limits):
+    """Use the preferred datatype of the distribution, i.e. 64-bit floats and
+    integers for the built-in distributions."""
+
+    return np.dtype(distribution.dtype)
+
+
+def compact(distribution, param_limits):
+    """Use the smallest datatype that can hold the values of the distribution.
+    Floats are kept in single precision. Integers use the smallest signed
+    type that holds the limits on the values of the distribution given by its
+    ``get_value_limits`` method, or the preferred datatype if there are no
+    such limits. Distributions that only take the values zero and one, such
+    as the Bernoulli distribution, are boolean so that their columns are
+    packed into bits by ``edo.storage.ColumnStore``."""
+
+    dtype = np.dtype(distribution.dtype)
+    if dtype.kind == "f":
+        return np.dtype(np.float32)
+
+    if dtype.kind not in "iu":
+        return dtype
+
+    get_value_limits = getattr(distribution, "get_value_limits", None)
+    limits = get_value_limits(param_limits) if get_value_limits else None
+    if limits is None:
+        return dtype
+
+    lower, upper = limits
+    if lower >= 0 and upper <= 1:
+        return np.dtype(bool)
+
+    for candidate in INTEGER_DTYPES:
+        info = np.iinfo(candidate)
+        if info.min <= lower and upper <= info.max:
+            return np.dtype(candidate)
+
+    return dtype
+
+
+DTYPE_POLICIES = {"default": default, "compact": compact}
@@ -1,16 +1,91 @@
 """ The distribution subtype handler. """
 
-import os
+import io
 import pathlib
 import pickle
+from collections import namedtuple
 
 import numpy as np
 
+from .dtypes import get_dtype
+
+LENGTH_BYTES = 8
+
+
+class Subtype(
+    namedtuple(
+        "Subtype", ["distribution", "subtype_id", "param_limits", "family"]
+    )
+):
+    """An immutable record of a distribution subtype: the distribution class,
+    the identifier of the subtype in its family and the limits on its
+    parameters. Calling a subtype with a PRNG creates an instance of the
+    distribution class with parameters sampled from these limits.
+
+    Each instance refers back to its subtype through its ``family`` and
+    ``subtype_id`` attributes, and keeps the ``param_limits`` and column
+    ``dtype`` it was created with. Instances are of the distribution class
+    itself, so they can be pickled like any other object. The family is left
+    out of the pickle, leaving only the identifier of the subtype.
+    """
+
+    __slots__ = ()
+
+    def __call__(self, random_state):
+
+        pdf = self._new_instance()
+        pdf.__init__(random_state)
+
+        return pdf
+
+    @property
+    def name(self):
+        """ The name of the distribution. """
+
+        return self.distribution.name
+
+    @property
+    def dtype(self):
+        """The datatype of the columns sampled from the subtype under the
+        datatype policy of its family."""
+
+        return get_dtype(
+            self.distribution, self.param_limits, self.family.dtype_policy
+        )
+
+    @property
+    def hard_limits(self):
+        """ The limits that the parameter limits may not leave. """
+
+        return self.distribution.hard_limits
+
+    def from_params(self, params):
+        """Recover an instance of the subtype with the parameters in
+        ``params`` rather than sampling them."""
+
+        pdf = self._new_instance()
+        pdf.__dict__.update(params)
+
+        return pdf
+
+    def _new_instance(self):
+        """Create an instance of the distribution class without initialising
+        its parameters."""
+
+        distribution = self.distribution
+        pdf = distribution.__new__(distribution)
+        pdf.family = self.family
+        pdf.subtype_id = self.subtype_id
+        pdf.param_limits = self.param_limits
+        pdf.dtype = self.dtype
+
+        return pdf
+
 
 class Family:
     """A class for handling all concurrent subtypes of a distribution class. A
-    subtype is an independent copy of the distribution class allowing more of
-    the search space to be explored.
+    subtype is an immutable record of the distribution class with its own
+    parameter limits, allowing more of the search space to be explored.
 
     Parameters
     ----------
@@ -20,6 +95,16 @@ class Family:
     max_subtypes : int
         The maximum number of subtypes in the family that are currently being
         used in a run of the EA. There is no limit by default.
+    registry_size : int
+        The number of subtypes to keep in ``all_subtypes`` before any that are
+        no longer used by the population are evicted, oldest first. Evicted
+        subtypes that have been saved stay on disk so that earlier generations
+        can still be read. There is no limit by default.
+    dtype_policy : str or func
+        The policy used to choose the datatype of the columns sampled from the
+        subtypes. Either ``"default"``, ``"compact"`` or a function with the
+        same signature as those in ``edo.dtypes``. Defaults to ``"default"``,
+        which uses the preferred datatype of the distribution.
 
     Attributes
     ----------
@@ -33,78 +118,208 @@ class Family:
         subtype. This gets updated during a run to those that are currently
         being used in the population.
     all_subtypes : dict
-        A dictionary of all subtypes that have been created in the family.
-    random_state : np.random.RandomState
+        A dictionary of all subtypes that have been created in the family and
+        have not been evicted.
+    dirty_subtypes : set
+        The identifiers of any subtypes that have been created or changed
+        since the family was last saved. Only these subtypes are written the
+        next time the family is saved to the same place.
+    updated_subtypes : set
+        The identifiers of any subtypes whose parameter limits have been
+        updated, such as by shrinking, since the subtypes were last merged.
+        Only these subtypes are considered for merging.
+    random_state : np.random.Generator or np.random.RandomState
         The PRNG associated with this family to be used for the sampling and
         creation of subtypes.
     """
 
-    def __init__(self, distribution, max_subtypes=None):
+    def __init__(
+        self,
+        distribution,
+        max_subtypes=None,
+        registry_size=None,
+        dtype_policy="default",
+    ):
 
         self.distribution = distribution
         self.max_subtypes = max_subtypes
+        self.registry_size = registry_size
+        self.dtype_policy = dtype_policy
 
         self.name = distribution.name + "Family"
         self.subtype_id = 0
         self.subtypes = {}
         self.all_subtypes = {}
+        self.dirty_subtypes = set()
+        self.updated_subtypes = set()
         self.random_state = np.random.mtrand._rand
 
+        self._save_root = None
+
     def __repr__(self):
 
         return f"{self.name}(subtypes={self.subtype_id})"
 
-    def add_subtype(self, subtype_name=None, attributes=None):
-        """Create a copy of the distribution class that is identical and
-        independent of the original."""
+    def add_subtype(self, param_limits=None):
+        """Create a new subtype with ``param_limits``. By default, these are a
+        copy of the limits of the distribution class."""
 
-        if subtype_name is None:
-            subtype_name = f"{self.distribution.name}Subtype"
+        if param_limits is None:
+            param_limits = self.distribution.param_limits
 
-        if attributes is None:
-            attributes = _get_attrs_for_subtype(self.distribution)
-
-        subtype = type(subtype_name, (self.distribution,), attributes)
-        subtype.subtype_id = self.subtype_id
-        subtype.family = self
-        subtype.to_dict = _subtype_to_dict
+        param_limits = {
+            name: list(limits) for name, limits in param_limits.items()
+        }
+        subtype = Subtype(
+            self.distribution, self.subtype_id, param_limits, self
+        )
 
         self.subtypes[self.subtype_id] = subtype
         self.all_subtypes[self.subtype_id] = subtype
+        self.dirty_subtypes.add(self.subtype_id)
         self.subtype_id += 1
 
     def make_instance(self, random_state):
         """Select an existing subtype at random -- or create a new one if there
         is space available -- and return an instance of that subtype."""
 
-        choices = list(self.subtypes)
-        if self.max_subtypes is None or len(choices) < self.max_subtypes:
-            choices.append(self.subtype_id)
+        return self.make_instances(1, random_state)[0]
 
-        choice = self.random_state.choice(choices)
-        if choice == self.subtype_id:
-            self.add_subtype()
+    def make_instances(self, n, random_state):
+        """Select ``n`` subtypes at random -- creating new ones as they are
+        chosen if there is space available -- and return an instance of each.
+        The random numbers for all of the choices are drawn at once, and each
+        is scaled to the number of subtypes that could be chosen at that
+        point. The parameters of each instance are sampled using
+        ``random_state``."""
 
-        instance = self.subtypes[choice](random_state)
-        return instance
+        draws = self.random_state.random(n)
+        subtype_ids = list(self.subtypes)
 
-    def save(self, root=".edocache"):
-        """Save the current subtypes in the family and the family's random
-        state in the ``root`` directory."""
+        instances = []
+        for draw in draws:
+            nchoices = len(subtype_ids)
+            if self.max_subtypes is None or nchoices < self.max_subtypes:
+                nchoices += 1
+
+            choice = int(draw * nchoices)
+            if choice == len(subtype_ids):
+                subtype_ids.append(self.subtype_id)
+                self.add_subtype()
 
-        path = pathlib.Path(f"{root}/subtypes/{self.distribution.name}")
-        path.mkdir(exist_ok=True, parents=True)
+            subtype = self.subtypes[subtype_ids[choice]]
+            instances.append(subtype(random_state))
 
-        with open(path / "state.pkl", "wb") as state:
-            pickle.dump(
-                self.random_state, state, protocol=pickle.HIGHEST_PROTOCOL
+        return instances
+
+    def update_subtype(self, subtype_id, param_limits):
+        """Replace the subtype with identifier ``subtype_id`` by one with new
+        ``param_limits``. Existing instances keep the limits they were created
+        with."""
+
+        subtype = self.all_subtypes[subtype_id]._replace(
+            param_limits=param_limits
+        )
+        self.all_subtypes[subtype_id] = subtype
+        if subtype_id in self.subtypes:
+            self.subtypes[subtype_id] = subtype
+
+        self.dirty_subtypes.add(subtype_id)
+        self.updated_subtypes.add(subtype_id)
+
+        return subtype
+
+    def merge_subtypes(self):
+        """Merge any current subtypes that have been updated since the last
+        merge and whose parameter limits have become identical, such as after
+        shrinking, into the oldest of them. Subtypes that have not been
+        updated, like those with the limits they were created with, are left
+        alone. The merged subtypes are no longer current. Return a dictionary
+        mapping the identifier of each merged subtype to the one it was merged
+        into."""
+
+        merged, canonical = {}, {}
+        updated_ids = self.updated_subtypes.intersection(self.subtypes)
+        for subtype_id in sorted(updated_ids):
+            subtype = self.subtypes[subtype_id]
+            key = tuple(
+                (name, tuple(limits))
+                for name, limits in sorted(subtype.param_limits.items())
             )
+            if key in canonical:
+                merged[subtype_id] = canonical[key]
+            else:
+                canonical[key] = subtype_id
+
+        for subtype_id in merged:
+            self.subtypes.pop(subtype_id)
 
-        for subtype_id, subtype in self.all_subtypes.items():
+        self.updated_subtypes = set()
 
-            attributes = _get_attrs_for_subtype(subtype)
-            with open(path / f"{subtype_id}.pkl", "wb") as sub:
-                pickle.dump(attributes, sub, protocol=pickle.HIGHEST_PROTOCOL)
+        return merged
+
+    def evict_subtypes(self, used_ids):
+        """Evict the oldest subtypes from ``all_subtypes`` until there are no
+        more than ``registry_size`` of them. Only those subtypes that are
+        neither current nor in ``used_ids`` may be evicted. Return the
+        identifiers of the evicted subtypes."""
+
+        if self.registry_size is None:
+            return []
+
+        nexcess = len(self.all_subtypes) - self.registry_size
+        in_use = set(used_ids).union(self.subtypes)
+
+        evicted = []
+        for subtype_id in sorted(self.all_subtypes):
+            if len(evicted) >= nexcess:
+                break
+
+            if subtype_id not in in_use:
+                evicted.append(subtype_id)
+
+        for subtype_id in evicted:
+            self.all_subtypes.pop(subtype_id)
+            self.dirty_subtypes.discard(subtype_id)
+
+        return evicted
+
+    def save(self, root=".edocache"):
+        """Save the current subtypes in the family, the family's random state
+        and the name of its datatype policy to a single file in the ``root``
+        directory. A policy given as a function is not saved. If the family
+        was last saved to ``root`` then only those subtypes that have been
+        created or changed since then are appended to the file. Otherwise,
+        the file is written afresh with every subtype, and any evicted
+        subtypes are carried over from where the family was last saved so
+        that earlier generations can still be read."""
+
+        path = _get_family_path(root, self.distribution.name)
+        path.parent.mkdir(exist_ok=True, parents=True)
+
+        fresh = self._save_root != path
+        subtype_ids = self.all_subtypes if fresh else self.dirty_subtypes
+
+        dtype_policy = self.dtype_policy
+        if not isinstance(dtype_policy, str):
+            dtype_policy = None
+
+        records = [("state", self.random_state), ("dtype_policy", dtype_policy)]
+        if fresh and self._save_root is not None and self._save_root.exists():
+            evicted = _read_records(self._save_root)
+            for key in ("state", "dtype_policy", *self.all_subtypes):
+                evicted.pop(key, None)
+
+            records.extend(evicted.items())
+
+        for subtype_id in subtype_ids:
+            param_limits = self.all_subtypes[subtype_id].param_limits
+            records.append((subtype_id, param_limits))
+
+        _append_records(path, records, fresh)
+
+        self.dirty_subtypes = set()
+        self._save_root = path
 
     def reset(self, root=None):
         """Reset the family to have no subtypes and the default ``numpy`` PRNG.
@@ -114,61 +329,106 @@ class Family:
         self.subtype_id = 0
         self.subtypes.clear()
         self.all_subtypes.clear()
+        self.dirty_subtypes = set()
+        self.updated_subtypes = set()
         self.random_state = np.random.mtrand._rand
+        self._save_root = None
 
         if root is not None:
-            os.system(f"rm -r {root}/subtypes/{self.distribution.name}")
+            try:
+                _get_family_path(root, self.distribution.name).unlink()
+            except FileNotFoundError:
+                pass
 
     @classmethod
-    def load(cls, distribution, root=".edocache"):
-        """Load in any existing cached subtype dictionaries for
-        ``distribution`` and restore the subtype along with the family's random
-        state."""
+    def load(cls, distribution, root=".edocache", dtype_policy=None):
+        """Load in any existing cached subtype parameter limits for
+        ``distribution`` and restore the subtypes along with the family's
+        random state. The whole file is read at once and only the latest
+        record for each subtype is used. The family takes ``dtype_policy`` if
+        it is given, and otherwise the saved policy or ``"default"``."""
+
+        path = _get_family_path(root, distribution.name)
+        records = _read_records(path)
+
+        saved_policy = records.pop("dtype_policy", None)
+        family = Family(
+            distribution, dtype_policy=dtype_policy or saved_policy or "default"
+        )
+        family.random_state = records.pop("state")
+        for subtype_id in sorted(records):
+            family.subtype_id = subtype_id
+            family.add_subtype(records[subtype_id])
 
-        family = Family(distribution)
-        name = distribution.name
-        path = pathlib.Path(f"{root}/subtypes/{name}/")
+        return family
 
-        with open(path / "state.pkl", "rb") as state:
-            family.random_state = pickle.load(state)
 
-        subtype_paths = sorted(
-            path.glob(r"[0-9]*.pkl"), key=lambda p: int(p.stem)
-        )
-        for path in subtype_paths:
+def _get_family_path(root, name):
+    """ Get the path to the file of the family of distribution ``name``. """
 
-            with open(path, "rb") as sub:
-                attributes = pickle.load(sub)
-                family.add_subtype(attributes=attributes)
+    return pathlib.Path(f"{root}/subtypes/{name}.family")
 
-        return family
 
+def _append_records(path, records, fresh=False):
+    """Append each key-value pair in ``records`` to the file at ``path`` as a
+    pickled value prefixed by its length in bytes. The file ends with an index
+    that maps each key to the offset of its latest record, and that index is
+    replaced by the new one. If ``fresh`` then the file is written from
+    scratch."""
+
+    append = not fresh and path.exists()
+    with open(path, "r+b" if append else "wb") as file:
+        index = {}
+        if append:
+            index, end = _read_index(file)
+            file.seek(end)
+            file.truncate()
+
+        for key, value in records:
+            index[key] = file.tell()
+            _write_record(file, value)
+
+        length = _write_record(file, index)
+        file.write(length.to_bytes(LENGTH_BYTES, "little"))
+
+
+def _write_record(file, value):
+    """Write ``value`` to ``file`` as a pickle prefixed by its length. Return
+    the length of the record in bytes."""
+
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    file.write(len(data).to_bytes(LENGTH_BYTES, "little"))
+    file.write(data)
+
+    return LENGTH_BYTES + len(data)
+
+
+def _read_record(file, offset):
+    """ Read the record at ``offset`` in ``file``. """
+
+    file.seek(offset)
+    length = int.from_bytes(file.read(LENGTH_BYTES), "little")
 
-def _get_attrs_for_subtype(obj):
-    """ Get the attributes needed from ``obj`` to make or save a subtype. """
+    return pickle.loads(file.read(length))
 
-    attributes = {
-        "name": obj.name,
-        "dtype": obj.dtype,
-        "hard_limits": obj.hard_limits,
-        "param_limits": dict(obj.param_limits),
-        "__init__": obj.__init__,
-        "__repr__": obj.__repr__,
-    }
 
-    return attributes
+def _read_index(file):
+    """Read the index from the end of a family file. Return the index and the
+    offset at which it starts."""
 
+    file.seek(-LENGTH_BYTES, io.SEEK_END)
+    length = int.from_bytes(file.read(LENGTH_BYTES), "little")
+    end = file.seek(-LENGTH_BYTES - length, io.SEEK_END)
 
-def _subtype_to_dict(self):
-    """Convert an unpickleable subtype instance to a dictionary so it can be
-    recovered at a later date."""
+    return _read_record(file, end), end
 
-    attributes = {"name": self.name, "subtype_id": self.subtype_id}
 
-    params = {}
-    for param, val in vars(self).items():
-        params[param] = val
+def _read_records(path):
+    """Read the latest record for every key in the family file at ``path``.
+    The file is read into memory in one go and the records are taken from
+    there."""
 
-    attributes["params"] = params
+    file = io.BytesIO(path.read_bytes())
+    index, _ = _read_index(file)
 
-    return attributes
+    return {key: _read_record(file, offset) for key, offset in index.items()}
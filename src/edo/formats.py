@@ -0,0 +1,117 @@
+""" The formats in which the dataset of an individual can be written. """
+
+from collections import defaultdict, namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+Format = namedtuple("Format", ["filename", "write", "read"])
+
+
+def write_csv(individual, path):
+    """Write the dataset of ``individual`` to ``main.csv`` in ``path``. This
+    is the slowest format and floats lose precision, but it can be read by
+    anything."""
+
+    individual.dataframe.to_csv(Path(path) / "main.csv", index=False)
+
+
+def read_csv(path, method=pd):
+    """Read a dataset from ``main.csv`` in ``path`` using ``method``, either
+    ``pandas`` or ``dask.dataframe``."""
+
+    dataframe = method.read_csv(Path(path) / "main.csv")
+    return _label_columns(dataframe)
+
+
+def write_npz(individual, path):
+    """Write the dataset of ``individual`` to ``main.npz`` in ``path`` with
+    one block for each datatype. Each block is stored alongside the positions
+    of its columns in the dataset. The columns are taken from the individual
+    without building its dataframe."""
+
+    columns = individual.columns
+    nrows = len(columns[0]) if columns else len(individual.dataframe)
+
+    positions = defaultdict(list)
+    for j, column in enumerate(columns):
+        positions[column.dtype].append(j)
+
+    arrays = {"nrows": np.array(nrows)}
+    for i, js in enumerate(positions.values()):
+        arrays[f"block_{i}"] = np.column_stack([columns[j] for j in js])
+        arrays[f"positions_{i}"] = np.array(js, dtype=int)
+
+    np.savez(Path(path) / "main.npz", **arrays)
+
+
+def read_npz(path, method=pd):
+    """Read a dataset from the blocks in ``main.npz`` in ``path``. If
+    ``method`` is not ``pandas`` then the dataset is converted with its
+    ``from_pandas`` function."""
+
+    columns = {}
+    with np.load(Path(path) / "main.npz") as arrays:
+        nrows = int(arrays["nrows"])
+        nblocks = (len(arrays.files) - 1) // 2
+        for i in range(nblocks):
+            block = arrays[f"block_{i}"]
+            for k, j in enumerate(arrays[f"positions_{i}"].tolist()):
+                columns[j] = block[:, k]
+
+    dataframe = pd.DataFrame(
+        {j: columns[j] for j in sorted(columns)}, index=pd.RangeIndex(nrows)
+    )
+    if method is not pd:
+        dataframe = method.from_pandas(dataframe, npartitions=1)
+
+    return dataframe
+
+
+def write_parquet(individual, path):
+    """Write the dataset of ``individual`` to ``main.parquet`` in ``path``.
+    Parquet needs its columns to be labelled by strings."""
+
+    dataframe = individual.dataframe.rename(columns=str)
+    dataframe.to_parquet(Path(path) / "main.parquet", index=False)
+
+
+def read_parquet(path, method=pd):
+    """Read a dataset from ``main.parquet`` in ``path`` using ``method``,
+    either ``pandas`` or ``dask.dataframe``."""
+
+    dataframe = method.read_parquet(Path(path) / "main.parquet")
+    return _label_columns(dataframe)
+
+
+def get_format(path):
+    """Get the name of the format of the dataset written to ``path``. If no
+    dataset in a known format is found, this is ``"csv"``."""
+
+    for name, format_ in FORMATS.items():
+        if (Path(path) / format_.filename).exists():
+            return name
+
+    return "csv"
+
+
+def _label_columns(dataframe):
+    """ Label the columns of ``dataframe`` by their integer positions. """
+
+    dataframe.columns = [int(col) for col in dataframe.columns]
+    return dataframe
+
+
+FORMATS = {
+    "csv": Format("main.csv", write_csv, read_csv),
+    "npz": Format("main.npz", write_npz, read_npz),
+}
+
+if pyarrow is not None:
+    FORMATS["parquet"] = Format("main.parquet", write_parquet, read_parquet)
@@ -8,7 +8,11 @@ import dask.dataframe as dd
 import numpy as np
 import pandas as pd
 
+from .distributions.base import sample_into
 from .family import Family
+from .formats import FORMATS, get_format
+from .prng import integers
+from .storage import ColumnStore
 
 
 class Individual:
@@ -21,13 +25,21 @@ class Individual:
     metadata : list
         A list of distributions that are associated with the respective column
         of ``dataframe``.
-    random_state : np.random.RandomState, optional
+    random_state : np.random.Generator or np.random.RandomState, optional
         The PRNG for the individual. If not provided, the default PRNG is used.
 
     Attributes
     ----------
     fitness : float
         The fitness of the individual. Initialises as ``None``.
+    store : edo.storage.ColumnStore
+        The columnar storage of the dataset used by the operators. It is
+        created from ``dataframe`` when it is first needed.
+
+    An individual made by the operators is backed by its store alone, and its
+    ``dataframe`` is only built, once, when it is first asked for. Fitness
+    functions that work with arrays can use ``columns`` or ``values`` instead
+    to avoid building it at all.
     """
 
     def __init__(self, dataframe, metadata, random_state=None):
@@ -41,6 +53,67 @@ class Individual:
         self.random_state = random_state
         self.fitness = None
 
+    @property
+    def dataframe(self):
+        """The dataset of the individual. If the individual is backed by a
+        store, the dataframe is built from it and kept the first time it is
+        needed."""
+
+        if self._dataframe is None:
+            self._dataframe = self._store.to_dataframe()
+
+        return self._dataframe
+
+    @dataframe.setter
+    def dataframe(self, dataframe):
+
+        self._dataframe = dataframe
+        self._store = None
+
+    @property
+    def store(self):
+        """ The columnar storage of the dataset. """
+
+        if self._store is None:
+            self._store = ColumnStore.from_dataframe(self._dataframe)
+
+        return self._store
+
+    @property
+    def columns(self):
+        """The values of each column of the dataset as a list of arrays. If the
+        individual has a store, these are taken from it without building the
+        dataframe."""
+
+        if self._store is not None:
+            return [self._store.column(j) for j in range(self._store.ncols)]
+
+        return [
+            self._dataframe[col].to_numpy() for col in self._dataframe.columns
+        ]
+
+    @property
+    def values(self):
+        """The values of the dataset as a two-dimensional array with a column
+        for each column of the dataset, of their common datatype."""
+
+        columns = self.columns
+        if not columns:
+            return np.empty((len(self.dataframe), 0))
+
+        return np.column_stack(columns)
+
+    @classmethod
+    def from_store(cls, store, metadata, random_state=None):
+        """Create an instance of ``Individual`` from a ``ColumnStore`` and its
+        metadata. The dataframe is only built from ``store`` when it is first
+        needed."""
+
+        individual = cls(None, metadata, random_state)
+        individual._store = store
+
+        return individual
+
     def __repr__(self):
 
         return (
@@ -54,11 +127,18 @@ class Individual:
 
     @classmethod
     def from_file(
-        cls, path, distributions, family_root=".edocache", method="pandas"
+        cls,
+        path,
+        distributions,
+        family_root=".edocache",
+        method="pandas",
+        format=None,
     ):
         """Create an instance of ``Individual`` from the files at ``path`` and
         ``family_root`` using either ``pandas`` or ``dask`` to read in
-        individuals. Always fall back on ``pandas``."""
+        individuals. Always fall back on ``pandas``. The dataset is read in
+        ``format``, one of those in ``edo.formats.FORMATS``. If ``None``, the
+        format is found from the files at ``path``."""
 
         path = Path(path)
         distributions = {dist.name: dist for dist in distributions}
@@ -68,44 +148,45 @@ class Individual:
         else:
             method = pd
 
-        dataframe = method.read_csv(path / "main.csv")
-        dataframe.columns = map(int, dataframe.columns)
+        if format is None:
+            format = get_format(path)
+
+        dataframe = FORMATS[format].read(path, method)
 
         with open(path / "main.meta", "r") as meta:
             meta_dicts = json.load(meta)
 
-        metadata = []
-        for meta in meta_dicts:
-            distribution = meta["name"]
-            family = globals().get(f"{distribution}Family", None)
-            if family is None:
-                distribution = distributions[distribution]
-                family = Family.load(distribution, family_root)
-
-            subtype_id = meta["subtype_id"]
-            subtype = family.subtypes[subtype_id]
-
-            pdf = subtype.__new__(subtype)
-            pdf.__dict__.update(meta["params"])
-            metadata.append(pdf)
+        metadata = load_metadata(meta_dicts, distributions, family_root)
 
         with open(path / "main.state", "rb") as state:
             random_state = pickle.load(state)
 
         return Individual(dataframe, metadata, random_state)
 
-    def to_file(self, path, family_root=".edocache"):
-        """ Write self to file. """
+    def to_file(
+        self,
+        path,
+        family_root=".edocache",
+        save_families=True,
+        format="csv",
+    ):
+        """Write self to file. The dataset is written in ``format``, one of
+        those in ``edo.formats.FORMATS``: ``"csv"``, ``"npz"`` or, if
+        ``pyarrow`` is installed, ``"parquet"``. The families of the
+        distributions in the metadata are saved in ``family_root`` unless
+        ``save_families`` is ``False``, such as when the caller saves them
+        once for a whole population instead."""
 
         path = Path(path)
         path.mkdir(exist_ok=True, parents=True)
 
-        self.dataframe.to_csv(path / "main.csv", index=False)
+        FORMATS[format].write(self, path)
+
+        if save_families:
+            for family in dict.fromkeys(pdf.family for pdf in self.metadata):
+                family.save(family_root)
 
-        meta_dicts = []
-        for pdf in self.metadata:
-            pdf.family.save(family_root)
-            meta_dicts.append(pdf.to_dict())
+        meta_dicts = [pdf.to_dict() for pdf in self.metadata]
 
         with open(path / "main.meta", "w") as meta:
             json.dump(meta_dicts, meta)
@@ -118,6 +199,28 @@ class Individual:
         return path
 
 
+def load_metadata(meta_dicts, distributions, family_root, families=None):
+    """Recover the distribution instances described by ``meta_dicts`` from
+    the subtypes of their families. ``distributions`` maps the name of each
+    distribution to its class. The families are loaded from ``family_root``
+    as they are needed and are kept in ``families`` so that they can be
+    shared between calls."""
+
+    if families is None:
+        families = {}
+
+    metadata = []
+    for meta in meta_dicts:
+        name = meta["name"]
+        if name not in families:
+            families[name] = Family.load(distributions[name], family_root)
+
+        subtype = families[name].subtypes[meta["subtype_id"]]
+        metadata.append(subtype.from_params(meta["params"]))
+
+    return metadata
+
+
 def _sample_ncols(col_limits, random_state):
     """ Sample a valid number of columns from the column limits. """
 
@@ -129,57 +232,89 @@ def _sample_ncols(col_limits, random_state):
             integer_lim = lim
         integer_limits.append(integer_lim)
 
-    return random_state.randint(integer_limits[0], integer_limits[1] + 1)
+    return integers(random_state, integer_limits[0], integer_limits[1] + 1)
 
 
-def _get_minimum_columns(
-    nrows, col_limits, families, family_counts, random_state
-):
-    """If ``col_limits`` has a tuple lower limit then sample columns of the
+def _get_minimum_metadata(col_limits, families, family_counts, random_state):
+    """If ``col_limits`` has a tuple lower limit then make instances of the
     corresponding element of ``families`` as needed to satisfy this bound."""
 
-    columns, metadata = [], []
+    metadata = []
     for family, min_limit in zip(families, col_limits[0]):
-        for _ in range(min_limit):
-            meta = family.make_instance(random_state)
-            columns.append(meta.sample(nrows, random_state))
-            metadata.append(meta)
-            family_counts[family.name] += 1
-
-    return columns, metadata, family_counts
-
-
-def _get_remaining_columns(
-    columns,
-    metadata,
-    nrows,
-    ncols,
-    col_limits,
-    families,
-    weights,
-    family_counts,
-    random_state,
+        metadata.extend(family.make_instances(min_limit, random_state))
+        family_counts[family.name] += min_limit
+
+    return metadata, family_counts
+
+
+def _get_remaining_family_codes(
+    nremaining, col_limits, families, weights, family_counts, random_state
 ):
-    """Sample all remaining columns for the current individual. If
-    ``col_limits`` has a tuple upper limit then sample all remaining
-    columns for the individual without exceeding the bounds."""
+    """Choose the family of each remaining column by its index in
+    ``families``. If ``col_limits`` has a tuple upper limit then any choice
+    that would exceed the limit of its family is rejected, and replacements
+    are drawn until there are enough columns."""
 
-    while len(columns) < ncols:
-        family = random_state.choice(families, p=weights)
-        idx = families.index(family)
-        try:
-            if family_counts[family.name] < col_limits[1][idx]:
-                meta = family.make_instance(random_state)
-                columns.append(meta.sample(nrows, random_state))
-                metadata.append(meta)
-                family_counts[family.name] += 1
+    if not isinstance(col_limits[1], tuple):
+        return random_state.choice(len(families), size=nremaining, p=weights)
 
-        except TypeError:
-            meta = family.make_instance(random_state)
-            columns.append(meta.sample(nrows, random_state))
-            metadata.append(meta)
+    upper_limits = col_limits[1]
+    counts = [family_counts[family.name] for family in families]
+
+    codes = []
+    while len(codes) < nremaining:
+        draws = random_state.choice(
+            len(families), size=nremaining - len(codes), p=weights
+        )
+        for code in draws:
+            if counts[code] < upper_limits[code]:
+                codes.append(code)
+                counts[code] += 1
+
+    return np.array(codes, dtype=int)
+
+
+def _get_remaining_metadata(
+    metadata, ncols, col_limits, families, weights, family_counts, random_state
+):
+    """Make the instances for all remaining columns of the current individual.
+    If ``col_limits`` has a tuple upper limit then do so without exceeding the
+    bounds. The instances of each family are made together."""
+
+    codes = _get_remaining_family_codes(
+        ncols - len(metadata),
+        col_limits,
+        families,
+        weights,
+        family_counts,
+        random_state,
+    )
+
+    remaining = [None] * len(codes)
+    for code, family in enumerate(families):
+        positions = np.flatnonzero(codes == code)
+        instances = family.make_instances(len(positions), random_state)
+        for position, meta in zip(positions, instances):
+            remaining[position] = meta
+
+        family_counts[family.name] += len(positions)
+
+    return metadata + remaining
+
+
+def _sample_store(metadata, nrows, random_state):
+    """Sample every column of a dataset from its distribution in ``metadata``
+    straight into a preallocated ``ColumnStore``. Columns that the store packs
+    are sampled first and then packed."""
+
+    store = ColumnStore.empty([meta.dtype for meta in metadata], nrows)
+    for j, meta in enumerate(metadata):
+        if store.is_packed(j):
+            store.set_column(j, sample_into(meta, nrows, random_state))
+        else:
+            sample_into(meta, nrows, random_state, out=store.column(j))
 
-    return columns, metadata
+    return store
 
 
 def create_individual(row_limits, col_limits, families, weights, random_state):
@@ -199,25 +334,23 @@ def create_individual(row_limits, col_limits, families, weights, random_state):
     weights : list
         A sequence of relative weights with which to sample from ``families``.
         If ``None``, then sampling is uniform.
-    random_state : numpy.random.RandomState
+    random_state : numpy.random.Generator or numpy.random.RandomState
         The PRNG associated with the individual to use for its random sampling.
     """
 
-    nrows = random_state.randint(row_limits[0], row_limits[1] + 1)
+    nrows = integers(random_state, row_limits[0], row_limits[1] + 1)
     ncols = _sample_ncols(col_limits, random_state)
 
-    columns, metadata = [], []
+    metadata = []
     family_counts = {family.name: 0 for family in families}
 
     if isinstance(col_limits[0], tuple):
-        columns, metadata, pdf_counts = _get_minimum_columns(
-            nrows, col_limits, families, family_counts, random_state
+        metadata, family_counts = _get_minimum_metadata(
+            col_limits, families, family_counts, random_state
         )
 
-    columns, metadata = _get_remaining_columns(
-        columns,
+    metadata = _get_remaining_metadata(
         metadata,
-        nrows,
         ncols,
         col_limits,
         families,
@@ -226,5 +359,5 @@ def create_individual(row_limits, col_limits, families, weights, random_state):
         random_state,
     )
 
-    dataframe = pd.DataFrame({i: col for i, col in enumerate(columns)})
-    return Individual(dataframe, metadata, random_state)
+    store = _sample_store(metadata, nrows, random_state)
+    return Individual.from_store(store, metadata, random_state)
@@ -0,0 +1,155 @@
+""" A columnar index of the metadata of a collection of individuals. """
+
+from collections import defaultdict
+from operator import attrgetter
+
+import numpy as np
+
+
+class MetadataBank:
+    """A struct-of-arrays summary of the metadata of several individuals. The
+    columns of every individual are laid end to end, and for each column the
+    bank records which individual it belongs to, the index of its family and
+    the identifier of its subtype in integer arrays. Questions about the
+    metadata as a whole, such as how many columns of each family an
+    individual has, are then answered with a reduction over these arrays
+    rather than by visiting every distribution instance.
+
+    The bank is derived from the distribution instances and does not replace
+    them, so it should be rebuilt if the metadata change.
+
+    Parameters
+    ----------
+    metadatas : list
+        A list of the metadata of each individual.
+    families : list, optional
+        The families to index the columns by. Any family that is not in
+        ``families`` is added to the end of it in the order in which it is
+        found. If ``None``, the families are taken from the metadata.
+
+    Attributes
+    ----------
+    families : list
+        The families of the columns, in the order of their indices.
+    owners : numpy.ndarray
+        The index of the individual that each column belongs to.
+    family_codes : numpy.ndarray
+        The index in ``families`` of the family of each column.
+    subtype_ids : numpy.ndarray
+        The identifier of the subtype of each column.
+    """
+
+    def __init__(self, metadatas, families=None):
+
+        self.families = list(families or [])
+        self._metadatas = metadatas
+
+        codes = {family: code for code, family in enumerate(self.families)}
+        owners, family_codes, subtype_ids, pdfs = [], [], [], []
+        for owner, metadata in enumerate(metadatas):
+            pdfs.extend(metadata)
+            for pdf in metadata:
+                family = pdf.family
+                code = codes.get(family)
+                if code is None:
+                    code = codes[family] = len(self.families)
+                    self.families.append(family)
+
+                owners.append(owner)
+                family_codes.append(code)
+                subtype_ids.append(pdf.subtype_id)
+
+        self.owners = np.array(owners, dtype=int)
+        self.family_codes = np.array(family_codes, dtype=int)
+        self.subtype_ids = np.array(subtype_ids, dtype=int)
+
+        self._pdfs = np.empty(len(pdfs), dtype=object)
+        self._pdfs[:] = pdfs
+
+    def __repr__(self):
+
+        return (
+            f"MetadataBank(individuals={len(self._metadatas)}, "
+            f"columns={len(self.owners)})"
+        )
+
+    @classmethod
+    def from_individuals(cls, individuals, families=None):
+        """ Create a bank from the metadata of ``individuals``. """
+
+        metadatas = [individual.metadata for individual in individuals]
+        return cls(metadatas, families)
+
+    def get_family_counts(self):
+        """Get the number of columns of each family in each individual as an
+        array with a row for each individual and a column for each family."""
+
+        nfamilies = len(self.families)
+        counts = np.bincount(
+            self.owners * nfamilies + self.family_codes,
+            minlength=len(self._metadatas) * nfamilies,
+        )
+
+        return counts.reshape(len(self._metadatas), nfamilies)
+
+    def get_family_codes(self):
+        """Get the family codes of the columns of each individual as a list of
+        arrays, one for each individual in the order of its columns."""
+
+        ncols = np.bincount(self.owners, minlength=len(self._metadatas))
+        return np.split(self.family_codes, np.cumsum(ncols)[:-1])
+
+    def get_subtype_ids(self):
+        """Get a dictionary mapping each family to the identifiers of its
+        subtypes that are used by the columns, in the order they first
+        appear."""
+
+        pairs = np.column_stack((self.family_codes, self.subtype_ids))
+        _, first = np.unique(pairs, axis=0, return_index=True)
+
+        subtype_ids = defaultdict(list)
+        for code, subtype_id in pairs[np.sort(first)].tolist():
+            subtype_ids[self.families[code]].append(subtype_id)
+
+        return subtype_ids
+
+    def get_param_values(self):
+        """Get the values of each parameter of every subtype used by the
+        columns. Only those parameters with limits in the family's
+        distribution are gathered. The instances of each family are taken
+        from the bank in subtype order with one fancy index, and each
+        parameter is read from all of them at once into an array with a row
+        per instance, which is then split by subtype. Return a dictionary
+        keyed by the family and identifier of each subtype, whose values map
+        parameter names to flat arrays of values."""
+
+        param_values = {}
+        for code, family in enumerate(self.families):
+            positions = np.flatnonzero(self.family_codes == code)
+            if not positions.size:
+                continue
+
+            order = positions[
+                np.argsort(self.subtype_ids[positions], kind="stable")
+            ]
+
+            subtype_ids, starts = np.unique(
+                self.subtype_ids[order], return_index=True
+            )
+
+            pdfs = self._pdfs[order]
+            params = {
+                name: np.array(
+                    list(map(attrgetter(name), pdfs)), dtype=float
+                ).reshape(len(pdfs), -1)
+                for name in family.distribution.param_limits
+            }
+            for subtype_id, start, stop in zip(
+                subtype_ids.tolist(), starts, np.append(starts[1:], len(order))
+            ):
+                param_values[(family, subtype_id)] = {
+                    name: values[start:stop].ravel()
+                    for name, values in params.items()
+                }
+
+        return param_values
@@ -1,112 +1,173 @@
 """ Functions for the crossover process. """
 
-import pandas as pd
+import numpy as np
 
 from edo.individual import Individual
+from edo.storage import ColumnStore
 
-from .util import get_family_counts
+from .util import sample_column
 
 
-def _collate_parents(parent1, parent2):
-    """Collect the columns and metadata from each parent together. These lists
-    form a pool from which information is inherited during the crossover
-    process."""
+def _collate_parents(parent1, parent2, families, family_codes=None):
+    """Collect the metadata from each parent together. This list forms a pool
+    from which columns are inherited during the crossover process. Each
+    member of the pool is referred to by its position, and the index of its
+    family in ``families`` is recorded in an integer array. These indices are
+    taken from ``family_codes``, the codes of each parent, if it is given."""
 
-    parent_cols, parent_meta = [], []
-    for dataframe, metadata in [parent1, parent2]:
-        parent_cols += [dataframe[col] for col in dataframe.columns]
-        parent_meta += metadata
+    parent_meta = parent1.metadata + parent2.metadata
+    if family_codes is not None:
+        return parent_meta, np.concatenate(family_codes)
 
-    return parent_cols, parent_meta
+    codes = {family: code for code, family in enumerate(families)}
+    family_codes = np.array(
+        [codes[pdf.family] for pdf in parent_meta], dtype=int
+    )
 
+    return parent_meta, family_codes
 
-def _cross_minimum_columns(
-    parent_cols, parent_meta, col_limits, families, random_state
-):
+
+def _cross_minimum_columns(family_codes, col_limits, random_state):
     """In the case where ``col_limits`` has a tuple lower limit, inherit the
     minimum number of columns from two parents to satisfy this limit. Return
-    part of a whole individual and the adjusted parent information."""
+    the positions of the inherited columns in the pool and a mask of those
+    still available."""
 
-    columns, metadata = [], []
-    for limit, family in zip(col_limits[0], families):
-        family_instances = [
-            (col, pdf)
-            for col, pdf in zip(parent_cols, parent_meta)
-            if pdf.family is family
-        ]
+    picks = []
+    available = np.ones(len(family_codes), dtype=bool)
+    for code, limit in enumerate(col_limits[0]):
+        candidates = np.flatnonzero(family_codes == code)
+        chosen = random_state.choice(candidates, size=limit, replace=False)
+        picks.extend(chosen)
+        available[chosen] = False
 
-        for _ in range(limit):
-            idx = random_state.choice(len(family_instances))
-            col, pdf = family_instances.pop(idx)
-            columns.append(col)
-            metadata.append(pdf)
-
-    return columns, metadata, parent_cols, parent_meta
+    return picks, available
 
 
 def _cross_remaining_columns(
-    columns,
-    metadata,
-    ncols,
-    parent_cols,
-    parent_meta,
-    col_limits,
-    families,
-    random_state,
+    picks, available, ncols, family_codes, col_limits, random_state
 ):
     """Regardless of whether ``col_limits`` has a tuple upper limit or not,
     inherit all remaining columns from the two parents so as not to exceed this
-    upper bound. Return the components of a full individual."""
-
-    family_counts = get_family_counts(metadata, families)
-    while len(columns) < ncols:
-        idx = random_state.choice(len(parent_cols))
-
-        try:
-            pdf = parent_meta[idx]
-            family = pdf.family
-            family_idx = families.index(family)
-            if family_counts[family] < col_limits[1][family_idx]:
-                columns.append(parent_cols.pop(idx))
-                metadata.append(parent_meta.pop(idx))
-                family_counts[family] += 1
-
-        except TypeError:
-            columns.append(parent_cols.pop(idx))
-            metadata.append(parent_meta.pop(idx))
-
-    return columns, metadata
-
-
-def _adjust_column_lengths(columns, metadata, nrows, random_state):
-    """ Trim or fill in the values of each column as needed. """
-
-    idxs = None
-    adjusted_columns = []
-    for column, meta in zip(columns, metadata):
-        difference = len(column) - nrows
-        size = abs(difference)
-        if difference > 0:
-            if idxs is None:
-                idxs = random_state.choice(
-                    len(column), size=size, replace=False
-                )
-            column = column.drop(idxs, axis=0).reset_index(drop=True)
+    upper bound. Return the positions of all inherited columns in the pool."""
+
+    candidates = np.flatnonzero(available)
+    nremaining = ncols - len(picks)
+
+    if not isinstance(col_limits[1], tuple):
+        chosen = random_state.choice(candidates, size=nremaining, replace=False)
+        return np.concatenate([picks, chosen]).astype(int)
+
+    upper_limits = np.array(col_limits[1])
+    family_counts = np.bincount(
+        family_codes[picks], minlength=len(upper_limits)
+    )
+    picks = list(picks)
+    for idx in random_state.permutation(candidates):
+        if len(picks) == ncols:
+            break
+
+        code = family_codes[idx]
+        if family_counts[code] < upper_limits[code]:
+            picks.append(idx)
+            family_counts[code] += 1
+
+    return np.array(picks, dtype=int)
+
+
+def _gather_columns(parent1, parent2, picks):
+    """Get the stores and column indices in those stores of the columns at
+    ``picks`` in the pool. No data is copied."""
+
+    ncols1 = len(parent1.metadata)
+    sources = []
+    for idx in picks:
+        if idx < ncols1:
+            sources.append((parent1.store, idx))
+        else:
+            sources.append((parent2.store, idx - ncols1))
+
+    return sources
+
+
+def _adjust_column_lengths(sources, metadata, nrows, random_state):
+    """Trim or fill in the values of each column as needed, writing them into
+    a preallocated store with one block for each datatype. Longer columns are
+    all trimmed with one shared array of row indices, and each shorter column
+    is filled with a single sample from its distribution. Columns that already
+    have ``nrows`` values are shared with their parent until they are written
+    to."""
+
+    lengths = [source.nrows for source, _ in sources]
+    longest = max(lengths, default=nrows)
+    if longest > nrows:
+        drop = random_state.choice(longest, size=longest - nrows, replace=False)
+        keep = np.delete(np.arange(longest), drop)
+
+    store = ColumnStore.empty(
+        [
+            None if length == nrows else source.dtype(k)
+            for length, (source, k) in zip(lengths, sources)
+        ],
+        nrows,
+    )
+    for j, (length, meta) in enumerate(zip(lengths, metadata)):
+        source, k = sources[j]
+        if length == nrows:
+            store.link(j, source, k)
+        elif length > nrows:
+            _trim_column(store, j, source, k, keep)
         else:
-            column = column.append(
-                pd.Series(meta.sample(size, random_state)), ignore_index=False
-            ).reset_index(drop=True)
+            _fill_column(store, j, source, k, meta, random_state)
 
-        adjusted_columns.append(column)
+    return store
 
-    return adjusted_columns
 
+def _trim_column(store, j, source, k, keep):
+    """Write the values of column ``k`` in ``source`` at the rows in ``keep``
+    to column ``j`` of ``store``. Packed columns are trimmed bit by bit."""
 
-def crossover(parent1, parent2, col_limits, families, random_state, prob=0.5):
+    if store.is_packed(j):
+        store.set_column(j, source.take(k, keep))
+    else:
+        np.take(source.column(k), keep, out=store.column(j))
+
+
+def _fill_column(store, j, source, k, meta, random_state):
+    """Copy column ``k`` of ``source`` to the start of column ``j`` of
+    ``store`` and fill in the rest with a sample from ``meta``."""
+
+    length = source.nrows
+    if store.is_packed(j):
+        values = np.empty(store.nrows, dtype=bool)
+    else:
+        values = store.column(j)
+
+    values[:length] = source.column(k)
+    sample_column(
+        meta, store.nrows - length, random_state, out=values[length:]
+    )
+
+    if store.is_packed(j):
+        store.set_column(j, values)
+
+
+def crossover(
+    parent1,
+    parent2,
+    col_limits,
+    families,
+    random_state,
+    prob=0.5,
+    family_codes=None,
+):
     """Blend the information from two parents to create a new ``Individual``.
     Dimensions are inherited first, forming a "skeleton" that is filled with
     column-metadata pairs. These pairs are selected from either parent
-    uniformly. Missing values are filled in as necessary.
+    uniformly by their position in a pool of both parents' columns. Columns
+    are trimmed or have missing values filled in as necessary, and are gathered
+    into one block for each datatype. Any column that is inherited unchanged
+    shares its parent's data until it is first written to.
 
     Parameters
     ----------
@@ -120,24 +181,31 @@ def crossover(parent1, parent2, col_limits, families, random_state, prob=0.5):
     families : list
         Families of distributions with which to create new columns. Used in case
         of tuple column limits.
-    random_state : numpy.random.RandomState
+    random_state : numpy.random.Generator or numpy.random.RandomState
         The PRNG associated with the offspring.
     prob : float, optional
         The cut-off probability with which to inherit dimensions from
         ``parent1`` over ``parent2``.
+    family_codes : tuple, optional
+        The index in ``families`` of the family of each column of each
+        parent, such as from ``MetadataBank.get_family_codes``. If ``None``,
+        these are found from the metadata of the parents.
+
     Returns
     -------
     offspring : Individual
         A new individual formed from the dimensions and columns of its parents.
     """
 
-    parent_cols, parent_meta = _collate_parents(parent1, parent2)
-    columns, metadata = [], []
+    parent_meta, family_codes = _collate_parents(
+        parent1, parent2, families, family_codes
+    )
+    picks, available = [], np.ones(len(parent_meta), dtype=bool)
 
     if random_state.random() < prob:
-        nrows = len(parent1.dataframe)
+        nrows = parent1.store.nrows
     else:
-        nrows = len(parent2.dataframe)
+        nrows = parent2.store.nrows
 
     if random_state.random() < prob:
         ncols = len(parent1.metadata)
@@ -145,21 +213,16 @@ def crossover(parent1, parent2, col_limits, families, random_state, prob=0.5):
         ncols = len(parent2.metadata)
 
     if isinstance(col_limits[0], tuple):
-        columns, metadata, parent_cols, parent_meta = _cross_minimum_columns(
-            parent_cols, parent_meta, col_limits, families, random_state
+        picks, available = _cross_minimum_columns(
+            family_codes, col_limits, random_state
         )
 
-    columns, metadata = _cross_remaining_columns(
-        columns,
-        metadata,
-        ncols,
-        parent_cols,
-        parent_meta,
-        col_limits,
-        families,
-        random_state,
+    picks = _cross_remaining_columns(
+        picks, available, ncols, family_codes, col_limits, random_state
     )
-    columns = _adjust_column_lengths(columns, metadata, nrows, random_state)
+    metadata = [parent_meta[idx] for idx in picks]
+
+    sources = _gather_columns(parent1, parent2, picks)
+    store = _adjust_column_lengths(sources, metadata, nrows, random_state)
 
-    dataframe = pd.DataFrame({i: col.values for i, col in enumerate(columns)})
-    return Individual(dataframe, metadata, random_state)
+    return Individual.from_store(store, metadata, random_state)
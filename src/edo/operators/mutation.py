@@ -1,15 +1,29 @@
 """ Functions related to the mutation operator. """
 
+import numpy as np
+
 from edo.individual import Individual
 
-from .util import get_family_counts
+from .util import get_family_counts, sample_column
+
+SPARSE_THRESHOLD = 1e-3
 
 
-def mutation(individual, prob, row_limits, col_limits, families, weights=None):
+def mutation(
+    individual,
+    prob,
+    row_limits,
+    col_limits,
+    families,
+    weights=None,
+    family_counts=None,
+):
     """Mutate an individual. Here, the characteristics of an individual can be
     split into two parts: their dimensions, and their values. Each of these
     parts is mutated in a different way using the same probability,
-    ``prob``.
+    ``prob``. If ``prob`` is smaller than ``SPARSE_THRESHOLD``, the values are
+    mutated by skipping ahead between mutated cells rather than by drawing a
+    mask over every cell.
 
     Parameters
     ----------
@@ -27,6 +41,11 @@ def mutation(individual, prob, row_limits, col_limits, families, weights=None):
     weights : list, optional
         Probabilities with which to sample a distribution ``families``. If
         ``None``, sample uniformly.
+    family_counts : dict, optional
+        The number of columns of ``individual`` in each family, such as from
+        a ``MetadataBank`` of the whole population. These are only used if
+        ``col_limits`` has a tuple limit, and are found from the metadata of
+        ``individual`` if they are needed but not given.
 
     Returns
     -------
@@ -34,156 +53,225 @@ def mutation(individual, prob, row_limits, col_limits, families, weights=None):
         A (potentially) mutated individual.
     """
 
-    dataframe, metadata = individual
+    store, metadata = individual.store, individual.metadata
     random_state = individual.random_state
-    dataframe, metadata = mutate_nrows(
-        dataframe, metadata, row_limits, random_state, prob
+    store, metadata = mutate_nrows(
+        store, metadata, row_limits, random_state, prob
     )
-    dataframe, metadata = mutate_ncols(
-        dataframe, metadata, col_limits, families, weights, random_state, prob
+    store, metadata = mutate_ncols(
+        store,
+        metadata,
+        col_limits,
+        families,
+        weights,
+        random_state,
+        prob,
+        family_counts,
     )
 
-    dataframe = mutate_values(dataframe, metadata, random_state, prob)
-    return Individual(dataframe, metadata, random_state)
+    store = mutate_values(store, metadata, random_state, prob)
+    return Individual.from_store(store, metadata, random_state)
 
 
-def mutate_nrows(dataframe, metadata, row_limits, random_state, prob):
+def mutate_nrows(store, metadata, row_limits, random_state, prob):
     """Mutate the number of rows an individual has by adding a new row and/or
     dropping a row at random so as not to exceed the bounds of
     ``row_limits``."""
 
-    if random_state.random() < prob and dataframe.shape[0] < row_limits[1]:
-        dataframe = _add_row(dataframe, metadata, random_state)
+    if random_state.random() < prob and store.nrows < row_limits[1]:
+        store = _add_row(store, metadata, random_state)
 
-    if random_state.random() < prob and dataframe.shape[0] > row_limits[0]:
-        dataframe = _remove_row(dataframe, random_state)
+    if random_state.random() < prob and store.nrows > row_limits[0]:
+        store = _remove_row(store, random_state)
 
-    return dataframe, metadata
+    return store, metadata
 
 
 def mutate_ncols(
-    dataframe, metadata, col_limits, families, weights, random_state, prob
+    store,
+    metadata,
+    col_limits,
+    families,
+    weights,
+    random_state,
+    prob,
+    family_counts=None,
 ):
     """Mutate the number of columns an individual has by adding a new column
     and/or dropping a column at random. In either case, the bounds defined in
-    ``col_limits`` cannot be exceeded."""
+    ``col_limits`` cannot be exceeded. Where these bounds are per family, the
+    number of columns in each family is found once, if ``family_counts`` is
+    not given, and kept up to date as columns are added and removed."""
+
+    if any(isinstance(limits, tuple) for limits in col_limits):
+        if family_counts is None:
+            family_counts = get_family_counts(metadata, families)
+        else:
+            family_counts = dict(family_counts)
 
     if isinstance(col_limits[1], tuple):
-        condition = dataframe.shape[1] < sum(col_limits[1])
+        condition = store.ncols < sum(col_limits[1])
     else:
-        condition = dataframe.shape[1] < col_limits[1]
+        condition = store.ncols < col_limits[1]
 
     if random_state.random() < prob and condition:
-        dataframe, metadata = _add_col(
-            dataframe, metadata, col_limits, families, weights, random_state
+        store, metadata = _add_col(
+            store,
+            metadata,
+            col_limits,
+            families,
+            weights,
+            random_state,
+            family_counts,
         )
 
     if isinstance(col_limits[0], tuple):
-        condition = dataframe.shape[1] > sum(col_limits[0])
+        condition = store.ncols > sum(col_limits[0])
     else:
-        condition = dataframe.shape[1] > col_limits[0]
+        condition = store.ncols > col_limits[0]
 
     if random_state.random() < prob and condition:
-        dataframe, metadata = _remove_col(
-            dataframe, metadata, col_limits, families, random_state
+        store, metadata = _remove_col(
+            store, metadata, col_limits, families, random_state, family_counts
         )
 
-    return dataframe, metadata
+    return store, metadata
 
 
-def mutate_values(dataframe, metadata, random_state, prob):
-    """Iterate over the values of ``dataframe`` and mutate them each with
-    probability ``prob``. Mutating a value is done by resampling from the
-    associated column distribution in ``metadata``."""
+def mutate_values(store, metadata, random_state, prob):
+    """Mutate the values of ``store`` each with probability ``prob``. For
+    each column, a mask over its rows is drawn in a single call and all of the
+    selected values are resampled at once from the associated column
+    distribution in ``metadata`` before being written back together. Small
+    resamples are served from the buffer of the distribution if it has one.
 
-    for j, col in enumerate(dataframe.columns):
-        pdf = metadata[j]
-        for i, value in enumerate(dataframe[col]):
-            if random_state.random() < prob:
-                value = pdf.sample(1, random_state)[0]
-                dataframe.iloc[i, j] = value
+    When ``prob`` is below ``SPARSE_THRESHOLD``, the cells to mutate are found
+    by skipping ahead from one mutation to the next instead so that the cost is
+    proportional to the number of mutated values."""
 
-    return dataframe
+    nrows, ncols = store.shape
+    if prob < SPARSE_THRESHOLD:
+        cells = _get_sparse_cells(nrows * ncols, prob, random_state)
+        cols, starts = np.unique(cells // nrows, return_index=True)
+        for j, rows in zip(cols, np.split(cells % nrows, starts[1:])):
+            values = metadata[j].draw(random_state, len(rows))
+            store.update(j, rows, values)
 
+        return store
 
-def _rename(dataframe):
-    """Rename columns or reindex to make sense after deletion or addition of a
-    new line."""
+    for j in range(ncols):
+        mask = random_state.random(nrows) < prob
+        nmutations = mask.sum()
+        if nmutations:
+            values = metadata[j].draw(random_state, nmutations)
+            store.update(j, mask, values)
 
-    dataframe = dataframe.reset_index(drop=True)
-    dataframe.columns = (i for i, _ in enumerate(dataframe.columns))
-    return dataframe
+    return store
 
 
-def _add_row(dataframe, metadata, random_state):
-    """Append a row to the dataframe by sampling values from each column's
-    distribution."""
+def _get_sparse_cells(ncells, prob, random_state):
+    """Get the sorted (column-major) positions of the cells to be mutated by
+    drawing the gaps between consecutive mutations from a geometric
+    distribution. Gaps are drawn in batches a little larger than the expected
+    number of mutations."""
 
-    dataframe = dataframe.append(
-        {i: pdf.sample(1, random_state)[0] for i, pdf in enumerate(metadata)},
-        ignore_index=True,
-    )
+    if prob <= 0 or ncells == 0:
+        return np.empty(0, dtype=int)
+
+    expected = ncells * prob
+    batch = int(expected + 3 * np.sqrt(expected)) + 1
+
+    cells, last = [], -1
+    while last < ncells:
+        positions = last + np.cumsum(random_state.geometric(prob, size=batch))
+        cells.append(positions)
+        last = positions[-1]
 
-    return dataframe
+    cells = np.concatenate(cells)
+    return cells[cells < ncells]
 
 
-def _remove_row(dataframe, random_state):
-    """ Remove a row from a dataframe at random. """
+def _add_row(store, metadata, random_state):
+    """Append a row to the dataset by sampling values from each column's
+    distribution. The row is written into the spare capacity of the store.
+    Each value is drawn with ``draw`` so that distributions with a
+    ``buffer_size`` hand out values they have already sampled."""
 
-    line = random_state.choice(dataframe.index)
-    dataframe = _rename(dataframe.drop(line, axis=0))
-    return dataframe
+    store.append_row(pdf.draw(random_state) for pdf in metadata)
 
+    return store
 
-def _add_col(dataframe, metadata, col_limits, families, weights, random_state):
-    """Add a new column to the end of the dataframe by sampling a distribution
+
+def _remove_row(store, random_state):
+    """ Remove a row from the dataset at random. """
+
+    line = random_state.choice(store.nrows)
+    store.remove_row(line)
+    return store
+
+
+def _add_col(
+    store,
+    metadata,
+    col_limits,
+    families,
+    weights,
+    random_state,
+    family_counts,
+):
+    """Add a new column to the end of the dataset by sampling a distribution
     from ``families`` according to the column limits and distribution weights
-    and sampling the required number of values from that distribution."""
+    and sampling the required number of values from that distribution. If
+    ``col_limits`` has a tuple limit then the number of columns in each
+    family, ``family_counts``, is used to keep to the upper one and is updated
+    with the new column."""
 
-    nrows, ncols = dataframe.shape
+    nrows, ncols = store.shape
     if isinstance(col_limits[1], tuple):
-        family_counts = get_family_counts(metadata, families)
-        while len(dataframe.columns) != ncols + 1:
+        while store.ncols != ncols + 1:
             family = random_state.choice(families, p=weights)
             idx = families.index(family)
             if family_counts[family] < col_limits[1][idx]:
                 pdf = family.make_instance(random_state)
-                dataframe[ncols] = pdf.sample(nrows, random_state)
+                store.append_column(sample_column(pdf, nrows, random_state))
                 metadata.append(pdf)
+                family_counts[family] += 1
 
-        dataframe = _rename(dataframe)
-        return dataframe, metadata
+        return store, metadata
 
     family = random_state.choice(families, p=weights)
     pdf = family.make_instance(random_state)
-    dataframe[ncols] = pdf.sample(nrows, random_state)
+    store.append_column(sample_column(pdf, nrows, random_state))
     metadata.append(pdf)
+    if family_counts is not None:
+        family_counts[family] += 1
 
-    dataframe = _rename(dataframe)
-    return dataframe, metadata
+    return store, metadata
 
 
-def _remove_col(dataframe, metadata, col_limits, families, random_state):
-    """ Remove a column (and its metadata) from an individual at random. """
+def _remove_col(
+    store, metadata, col_limits, families, random_state, family_counts
+):
+    """Remove a column (and its metadata) from an individual at random. If
+    ``col_limits`` has a tuple lower limit then ``family_counts`` is used to
+    keep to it, and is updated with the removed column."""
 
     if isinstance(col_limits[0], tuple):
-        ncols = dataframe.shape[1]
-        family_counts = get_family_counts(metadata, families)
-        while len(dataframe.columns) != ncols - 1:
-            col = random_state.choice(dataframe.columns)
-            idx = dataframe.columns.get_loc(col)
+        ncols = store.ncols
+        while store.ncols != ncols - 1:
+            idx = random_state.choice(ncols)
             pdf = metadata[idx]
             family = pdf.family
             family_idx = families.index(family)
             if family_counts[family] > col_limits[0][family_idx]:
-                dataframe = _rename(dataframe.drop(col, axis=1))
+                store.remove_column(idx)
                 metadata.pop(idx)
+                family_counts[family] -= 1
 
-        return dataframe, metadata
+        return store, metadata
 
-    col = random_state.choice(dataframe.columns)
-    idx = dataframe.columns.get_loc(col)
-    dataframe = _rename(dataframe.drop(col, axis=1))
+    idx = random_state.choice(store.ncols)
+    store.remove_column(idx)
     metadata.pop(idx)
 
-    return dataframe, metadata
+    return store, metadata
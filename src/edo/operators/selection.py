@@ -1,14 +1,21 @@
-""" The selection operator. """
+""" The selection operator and its strategies. """
 
 import numpy as np
 
 
 def selection(
-    population, pop_fitness, best_prop, lucky_prop, random_state, maximise=False
+    population,
+    pop_fitness,
+    best_prop,
+    lucky_prop,
+    random_state,
+    maximise=False,
+    method="truncation",
 ):
-    """Given a population, select a proportion of the "best" individuals and
-    another of the "lucky" individuals (if they are available) to form a set of
-    potential parents.
+    """Given a population, select a set of potential parents according to
+    ``method``. By default, this is truncation selection: a proportion of the
+    "best" individuals and another of the "lucky" individuals (if they are
+    available) are selected.
 
     Parameters
     ----------
@@ -22,38 +29,123 @@ def selection(
     lucky_prop : float
         The proportion of lucky individuals left in ``population`` to be
         selected after the "best" have been selected.
+    random_state : numpy.random.Generator or numpy.random.RandomState
+        The PRNG used to select the lucky individuals.
     maximise : bool, optional
         Determines whether an individual's fitness should be maximal or not.
         Defaults to ``False``.
+    method : str or func, optional
+        The selection strategy. Either ``"truncation"``, the name of another
+        strategy in ``SELECTION_METHODS`` or a function with the same signature
+        as those strategies. An unknown name raises a ``ValueError``. For any
+        strategy other than truncation, the number of parents is the combined
+        number of best and lucky individuals.
 
     Returns
     -------
-    parents : dict
-        The individuals chosen to potentially become parents and their index in
-        the current population.
+    parent_idxs : np.ndarray
+        The indices in ``population`` of the individuals chosen to potentially
+        become parents. Strategies other than truncation may select an
+        individual more than once.
     """
 
     size = len(population)
     num_best = int(best_prop * size)
     num_lucky = int(lucky_prop * size)
 
+    pop_fitness = np.asarray(pop_fitness, dtype=float)
     if maximise:
-        best_choice = np.argmax
-    else:
-        best_choice = np.argmin
-
-    population = population[:]
-    pop_fitness = pop_fitness[:]
-    parents = []
-    for _ in range(num_best):
-        if population != []:
-            best = best_choice(pop_fitness)
-            pop_fitness.pop(best)
-            parents.append(population.pop(best))
-
-    for _ in range(num_lucky):
-        if population != []:
-            lucky = random_state.choice(len(population))
-            parents.append(population.pop(lucky))
-
-    return parents
+        pop_fitness = -pop_fitness
+
+    if method == "truncation":
+        return truncation(pop_fitness, num_best, num_lucky, random_state)
+
+    if isinstance(method, str) and method not in SELECTION_METHODS:
+        raise ValueError(
+            f"Unknown selection method {method!r}. Use one of "
+            f"{['truncation', *sorted(SELECTION_METHODS)]} or a function."
+        )
+
+    strategy = SELECTION_METHODS.get(method, method)
+    num_parents = min(size, num_best + num_lucky)
+
+    return np.asarray(
+        strategy(pop_fitness, num_parents, random_state), dtype=int
+    )
+
+
+def truncation(pop_fitness, num_best, num_lucky, random_state):
+    """Select the ``num_best`` fittest individuals and then ``num_lucky``
+    others at random. The best individuals are found with a single partition
+    of the fitness scores, and the lucky ones are drawn together from the rest
+    of the population. The best individuals are returned first, in order of
+    their fitness."""
+
+    size = len(pop_fitness)
+
+    best = np.empty(0, dtype=int)
+    if num_best > 0:
+        best = np.argpartition(pop_fitness, num_best - 1)[:num_best]
+        best = best[np.argsort(pop_fitness[best], kind="stable")]
+
+    available = np.ones(size, dtype=bool)
+    available[best] = False
+    remaining = np.flatnonzero(available)
+
+    num_lucky = min(num_lucky, len(remaining))
+    lucky = random_state.choice(remaining, size=num_lucky, replace=False)
+
+    return np.concatenate([best, lucky]).astype(int)
+
+
+def tournament(pop_fitness, num_parents, random_state, size=2):
+    """Hold ``num_parents`` tournaments, each between ``size`` individuals
+    drawn at random, and select the fittest individual in each. All of the
+    tournaments are drawn and decided at once."""
+
+    entrants = random_state.choice(len(pop_fitness), size=(num_parents, size))
+    winners = np.argmin(pop_fitness[entrants], axis=1)
+
+    return entrants[np.arange(num_parents), winners]
+
+
+def stochastic_universal(pop_fitness, num_parents, random_state):
+    """Select individuals with probability proportional to how much fitter they
+    are than the least fit individual. Evenly spaced pointers with a single
+    random offset are used so that the number of times an individual is
+    selected is as close as possible to its expected value."""
+
+    weights = pop_fitness.max() - pop_fitness
+    total = weights.sum()
+    if not total > 0:
+        weights = np.ones_like(pop_fitness)
+        total = weights.sum()
+
+    step = total / max(num_parents, 1)
+    pointers = step * (random_state.random() + np.arange(num_parents))
+    parent_idxs = np.searchsorted(np.cumsum(weights), pointers, side="right")
+
+    return np.minimum(parent_idxs, len(pop_fitness) - 1)
+
+
+def rank(pop_fitness, num_parents, random_state, pressure=1.5):
+    """Select individuals with probabilities that decrease linearly with their
+    rank in the population. The fittest individual is ``pressure`` times as
+    likely to be selected as an average individual, where ``pressure`` is
+    between 1 and 2."""
+
+    size = len(pop_fitness)
+    ranks = np.empty(size)
+    ranks[np.argsort(pop_fitness, kind="stable")] = np.arange(size)
+
+    slope = 2 * (pressure - 1) / max(size - 1, 1)
+    probs = (pressure - slope * ranks) / size
+
+    return random_state.choice(size, size=num_parents, p=probs / probs.sum())
+
+
+SELECTION_METHODS = {
+    "tournament": tournament,
+    "stochastic_universal": stochastic_universal,
+    "rank": rank,
+}
@@ -1,24 +1,25 @@
 """ Functions for shrinking the search space. """
 
+import numpy as np
 
-def _get_param_values(parents, subtype, name):
-    """Get the parameter values from the parents for a particular distribution
-    subtype parameter."""
+from edo.metadata import MetadataBank
 
-    values = []
-    for _, metadata in parents:
-        for pdf in metadata:
-            if isinstance(pdf, subtype):
-                try:
-                    for val in vars(pdf)[name]:
-                        values.append(val)
-                except TypeError:
-                    values.append(vars(pdf)[name])
 
-    return values
+def _get_param_index(parents, bank=None):
+    """Group the parameter values of every distribution in the parents by
+    subtype and parameter name using ``bank``, a ``MetadataBank`` of the
+    parents, which is built if it is not given. Each subtype is keyed by its
+    family and identifier, and the values of each parameter with limits are
+    gathered into one array. Any other attributes of the distributions are
+    left out."""
 
+    if bank is None:
+        bank = MetadataBank.from_individuals(parents)
 
-def _adjust_subtype_param_limits(parents, subtype, itr, shrinkage):
+    return bank.get_param_values()
+
+
+def _get_subtype_param_limits(subtype, param_values, itr, shrinkage):
     r"""Adjust the search space of a distribution subtype's parameters
     according to a power law on its limits:
 
@@ -29,23 +30,37 @@ def _adjust_subtype_param_limits(parents, subtype, itr, shrinkage):
     where :math:`t` is the current timestep, :math:`u_t, l_t` denote the upper
     and lower limits of the parameter at iteration :math:`t`, and :math:`k \in
     (0, 1)` is some ``shrinkage`` factor.
+
+    The new limits are centred on the mean of ``param_values`` for each
+    parameter, without leaving the current limits, and are calculated for all
+    of the parameters at once. A mean outside of the current limits, as there
+    may be for instances created before the limits last shrank, is first
+    clipped to them. Subtypes are immutable, so a new dictionary of
+    limits is returned.
     """
 
-    for name, limits in subtype.param_limits.items():
-        values = _get_param_values(parents, subtype, name)
-        if values:
-            midpoint = sum(values) / len(values)
-            shift = (max(limits) - min(limits)) * (shrinkage ** itr) / 2
+    names = [name for name in subtype.param_limits if name in param_values]
+    limits = np.array(
+        [subtype.param_limits[name] for name in names], dtype=float
+    ).reshape(-1, 2)
+    minimums, maximums = limits.min(axis=1), limits.max(axis=1)
+
+    midpoints = np.array([param_values[name].mean() for name in names])
+    midpoints = np.clip(midpoints, minimums, maximums)
+    shifts = (maximums - minimums) * (shrinkage ** itr) / 2
+
+    lower = np.maximum(minimums, midpoints - shifts)
+    upper = np.minimum(maximums, midpoints + shifts)
 
-            lower = max(min(limits), midpoint - shift)
-            upper = min(min(limits), midpoint + shift)
+    new_limits = np.sort(np.column_stack((lower, upper)), axis=1)
 
-            subtype.param_limits[name] = sorted([lower, upper])
+    param_limits = dict(subtype.param_limits)
+    param_limits.update(zip(names, new_limits.tolist()))
 
-    return subtype
+    return param_limits
 
 
-def shrink(parents, families, itr, shrinkage):
+def shrink(parents, families, itr, shrinkage, bank=None):
     """Given the current progress of the evolutionary algorithm, shrink its
     search space, i.e. the parameter spaces for each of the distribution classes
     in ``families``.
@@ -60,6 +75,9 @@ def shrink(parents, families, itr, shrinkage):
         The current iteration.
     shrinkage : float
         The shrinkage factor between 0 and 1.
+    bank : edo.metadata.MetadataBank, optional
+        A bank of the metadata of ``parents`` to reuse. If ``None``, one is
+        built from them.
 
     Returns
     -------
@@ -67,11 +85,14 @@ def shrink(parents, families, itr, shrinkage):
         The altered families.
     """
 
+    index = _get_param_index(parents, bank)
     for family in families:
-        for i, subtype in family.subtypes.items():
-            subtype = _adjust_subtype_param_limits(
-                parents, subtype, itr, shrinkage
-            )
-            family.subtypes[i] = subtype
+        for i, subtype in list(family.subtypes.items()):
+            param_values = index.get((family, i))
+            if param_values is not None:
+                param_limits = _get_subtype_param_limits(
+                    subtype, param_values, itr, shrinkage
+                )
+                family.update_subtype(i, param_limits)
 
     return families
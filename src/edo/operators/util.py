@@ -1,11 +1,28 @@
 """ A collection of functions for use across several operators. """
 
+import numpy as np
+
+from edo.distributions.base import sample_into
+
 
 def get_family_counts(metadata, families):
     """Get the number of instances in `metadata` that belong to each family in
     `families`."""
 
-    return {
-        family: sum([pdf.family is family for pdf in metadata])
-        for family in families
-    }
+    family_counts = dict.fromkeys(families, 0)
+    for pdf in metadata:
+        if pdf.family in family_counts:
+            family_counts[pdf.family] += 1
+
+    return family_counts
+
+
+def sample_column(pdf, nrows, random_state, out=None):
+    """Sample a column of ``nrows`` values from ``pdf`` as an array of its
+    datatype. No copy is made if the sample is already of that type. If
+    ``out`` is given, the values are sampled into it instead."""
+
+    if out is not None:
+        return sample_into(pdf, nrows, random_state, out)
+
+    return np.asarray(pdf.sample(nrows, random_state), dtype=pdf.dtype)
@@ -1,16 +1,17 @@
 """ The evolutionary dataset optimisation algorithm class. """
 
-from collections import defaultdict
 from pathlib import Path
 
 import dask.dataframe as dd
-import numpy as np
 import pandas as pd
 
+from edo.archive import is_archive, read_generation, write_generation
 from edo.fitness import get_population_fitness, write_fitness
 from edo.individual import Individual
+from edo.metadata import MetadataBank
 from edo.operators import selection, shrink
 from edo.population import create_initial_population, create_new_population
+from edo.prng import get_entropy, get_random_state, get_streams, spawn
 
 
 class DataOptimiser:
@@ -59,6 +60,20 @@ class DataOptimiser:
     maximise : bool
         Determines whether ``fitness`` is a function to be maximised or not.
         Fitness scores are minimised by default.
+    selection_method : str or func
+        The strategy used to select parents. Defaults to ``"truncation"``,
+        which uses ``best_prop`` and ``lucky_prop``. The other built-in
+        strategies are ``"tournament"``, ``"stochastic_universal"`` and
+        ``"rank"``, which select ``best_prop + lucky_prop`` of the population.
+        A function with the same signature as those in
+        ``edo.operators.selection`` can also be used.
+    dtype_policy : str or func, optional
+        The policy used by every family to choose the datatype of its columns.
+        With ``"default"``, columns have 64-bit floats and integers. With
+        ``"compact"``, floats are single precision and integers use the
+        smallest type that holds the values of their distribution. A function
+        with the same signature as those in ``edo.dtypes`` can also be used.
+        If ``None``, as is the default, each family keeps its own policy.
     """
 
     def __init__(
@@ -76,6 +91,8 @@ class DataOptimiser:
         mutation_prob=0.01,
         shrinkage=None,
         maximise=False,
+        selection_method="truncation",
+        dtype_policy=None,
     ):
 
         self.fitness = fitness
@@ -91,8 +108,12 @@ class DataOptimiser:
         self.mutation_prob = mutation_prob
         self.shrinkage = shrinkage
         self.maximise = maximise
+        self.selection_method = selection_method
+        self.dtype_policy = dtype_policy
 
         self.converged = False
+        self.entropy = None
+        self.format = "csv"
         self.generation = 0
         self.population = None
         self.pop_fitness = None
@@ -115,6 +136,8 @@ class DataOptimiser:
         fitness_kwargs=None,
         stop_kwargs=None,
         dwindle_kwargs=None,
+        counter_streams=False,
+        format="csv",
     ):
         """Run the evolutionary algorithm under the given constraints.
 
@@ -126,8 +149,12 @@ class DataOptimiser:
             kept in memory and is returned at the end. If writing to file, one
             generation is held in memory at a time and everything is returned
             upon termination as a tuple containing ``dask`` objects.
-        random_state : int or np.ran.RandomState, optional
-            The random seed or state for a particular run of the algorithm. If
+        random_state : int or np.random.Generator, optional
+            The random seed or state for a particular run of the algorithm. A
+            seed or ``np.random.SeedSequence`` creates a new
+            ``np.random.Generator``, and the PRNGs of the individuals and
+            families are of the same kind as this one.
+            ``np.random.RandomState`` is still supported for compatibility. If
             ``None``, the default PRNG is used.
         processes : int, optional
             The number of parallel processes to use when calculating the
@@ -142,6 +169,21 @@ class DataOptimiser:
         dwindle_kwargs : dict, optional
             Any additional parameters for the ``dwindle`` method should be
             placed here.
+        counter_streams : bool, optional
+            If ``True``, the PRNG of each offspring is derived from the seed of
+            the run, the generation and the offspring's position in the
+            population alone, using ``edo.prng.get_stream``. The offspring are
+            then the same however many processes are used and in whatever
+            order they are made. Otherwise, each position in the population
+            keeps one PRNG for the whole run. Defaults to ``False``.
+        format : str, optional
+            The format in which to write the dataset of each individual when
+            ``root`` is given. One of those in ``edo.formats.FORMATS``:
+            ``"csv"`` by default, ``"npz"`` or, if ``pyarrow`` is installed,
+            ``"parquet"``. With ``"archive"``, each generation is written to
+            one data file and one metadata file by
+            ``edo.archive.write_generation`` rather than to a directory for
+            each individual.
 
         Returns
         -------
@@ -159,12 +201,9 @@ class DataOptimiser:
         if dwindle_kwargs is None:
             dwindle_kwargs = {}
 
-        if isinstance(random_state, int):
-            self.random_state = np.random.RandomState(random_state)
-        elif isinstance(random_state, np.random.RandomState):
-            self.random_state = random_state
-        else:
-            self.random_state = np.random.mtrand._rand
+        self.random_state = get_random_state(random_state)
+        self.entropy = get_entropy(random_state) if counter_streams else None
+        self.format = format
 
         self._initialise_run(processes, **fitness_kwargs)
         self._update_histories(root)
@@ -189,18 +228,13 @@ class DataOptimiser:
     def _initialise_run(self, processes, **fitness_kwargs):
         """ Create the initial population and get its fitness. """
 
-        state_seeds = self.random_state.randint(
-            np.iinfo(np.int32).max, size=self.size
-        )
-        self.states = {
-            i: np.random.RandomState(seed) for i, seed in enumerate(state_seeds)
-        }
+        self._update_states()
 
-        family_seeds = self.random_state.randint(
-            np.iinfo(np.int32).max, size=len(self.families)
-        )
-        for family, seed in zip(self.families, family_seeds):
-            family.random_state = np.random.RandomState(seed)
+        family_states = spawn(self.random_state, len(self.families))
+        for family, state in zip(self.families, family_states):
+            family.random_state = state
+            if self.dtype_policy is not None:
+                family.dtype_policy = self.dtype_policy
 
         self.population = create_initial_population(
             self.row_limits,
@@ -218,19 +252,24 @@ class DataOptimiser:
         """Create the next population via selection, crossover and mutation,
         update the family subtypes and get the new population's fitness."""
 
-        parents = selection(
+        parent_idxs = selection(
             self.population,
             self.pop_fitness,
             self.best_prop,
             self.lucky_prop,
             self.random_state,
             self.maximise,
+            self.selection_method,
         )
+        parents = [self.population[i] for i in parent_idxs]
+        bank = MetadataBank.from_individuals(parents, self.families)
 
-        self._update_subtypes(parents)
+        self._update_subtypes(parents, bank)
+        if self.entropy is not None:
+            self._update_states()
 
         self.population = create_new_population(
-            parents,
+            parent_idxs,
             self.population,
             self.crossover_prob,
             self.mutation_prob,
@@ -239,6 +278,7 @@ class DataOptimiser:
             self.families,
             self.weights,
             self.states,
+            bank,
         )
 
         self.pop_fitness = get_population_fitness(
@@ -247,8 +287,22 @@ class DataOptimiser:
 
         if self.shrinkage is not None:
             self.families = shrink(
-                parents, self.families, self.generation, self.shrinkage
+                parents, self.families, self.generation, self.shrinkage, bank
             )
+            self._merge_subtypes()
+
+        self._evict_subtypes()
+
+    def _update_states(self):
+        """Get the PRNG of each position in the population. With counter-based
+        streams, these are derived from the entropy of the run and the current
+        generation. Otherwise, they are spawned from the PRNG of the run."""
+
+        if self.entropy is not None:
+            self.states = get_streams(self.entropy, self.generation, self.size)
+        else:
+            states = spawn(self.random_state, self.size)
+            self.states = dict(enumerate(states))
 
     def _update_pop_history(self):
         """ Add the current generation to the history. """
@@ -266,17 +320,30 @@ class DataOptimiser:
             }
         )
 
-        self.fit_history = self.fit_history.append(
-            fitness_df, ignore_index=True
+        self.fit_history = pd.concat(
+            [self.fit_history, fitness_df], ignore_index=True
         )
 
     def _write_generation(self, root):
         """Write all individuals in a generation and their collective fitnesses
-        to file at the generation's directory in `root`."""
+        to file at the generation's directory in `root`, either in an archive
+        or in a directory for each individual. Each family is saved once for
+        the whole generation rather than by every individual."""
 
         write_fitness(self.pop_fitness, self.generation, root)
-        for idx, individual in enumerate(self.population):
-            individual.to_file(f"{root}/{self.generation}/{idx}/", root)
+        if self.format == "archive":
+            write_generation(self.population, f"{root}/{self.generation}")
+        else:
+            for idx, individual in enumerate(self.population):
+                individual.to_file(
+                    f"{root}/{self.generation}/{idx}/",
+                    root,
+                    save_families=False,
+                    format=self.format,
+                )
+
+        for family in self.families:
+            family.save(root)
 
     def _update_histories(self, root):
         """ Update the population and fitness histories. """
@@ -287,43 +354,84 @@ class DataOptimiser:
         else:
             self._write_generation(root)
 
-    def _get_current_subtypes(self, parents):
+    def _get_current_subtypes(self, parents, bank=None):
         """Get a dictionary mapping each family to all the subtype IDs that are
-        present in the parents."""
+        present in the parents, using ``bank`` if it is given rather than
+        building a ``MetadataBank`` of them."""
 
-        family_to_subtype_ids = defaultdict(list)
-        for parent in parents:
-            for pdf in parent.metadata:
-                family = pdf.family
-                subtype_id = pdf.subtype_id
-                record_subtypes = family_to_subtype_ids[family]
-                if subtype_id not in record_subtypes:
-                    family_to_subtype_ids[family].append(subtype_id)
+        if bank is None:
+            bank = MetadataBank.from_individuals(parents, self.families)
 
-        return family_to_subtype_ids
+        return bank.get_subtype_ids()
 
-    def _update_subtypes(self, parents):
+    def _update_subtypes(self, parents, bank=None):
         """Update the current subtypes for each family to be those present in
         the parents."""
 
-        current_subtypes = self._get_current_subtypes(parents)
+        current_subtypes = self._get_current_subtypes(parents, bank)
         for family, current_ids in current_subtypes.items():
             family.subtypes = {
                 subtype_id: family.all_subtypes[subtype_id]
                 for subtype_id in current_ids
             }
 
+    def _merge_subtypes(self):
+        """Merge any shrunk subtypes in each family that have identical
+        parameter limits and move the columns of the population over to the
+        subtypes they were merged into. Instances may be shared between
+        individuals, so each moved column is given a new instance of its
+        subtype with the same parameters rather than being changed in
+        place."""
+
+        merged = {family: family.merge_subtypes() for family in self.families}
+        if not any(merged.values()):
+            return
+
+        for individual in self.population:
+            metadata = []
+            for pdf in individual.metadata:
+                family = pdf.family
+                subtype_id = merged.get(family, {}).get(pdf.subtype_id)
+                if subtype_id is not None:
+                    subtype = family.all_subtypes[subtype_id]
+                    pdf = subtype.from_params(pdf.get_params())
+
+                metadata.append(pdf)
+
+            individual.metadata = metadata
+
+    def _evict_subtypes(self):
+        """Evict any subtypes that are no longer used by the population from
+        the registry of each family. Nothing is done if none of the families
+        has a limit on the size of its registry."""
+
+        if all(family.registry_size is None for family in self.families):
+            return
+
+        used_subtypes = self._get_current_subtypes(self.population)
+        for family in self.families:
+            family.evict_subtypes(used_subtypes.get(family, []))
+
 
 def _get_pop_history(root, generation, distributions):
     """Read in the individuals from each generation. The dataset is given
     as a `dask.dataframe.core.DataFrame` but the metadata are recovered
-    instances of their original class subtypes."""
+    instances of their original subtypes. A generation that was written as
+    an archive is read from it rather than from a directory for each
+    individual."""
 
     pop_history = []
     for gen in range(generation):
 
-        population = []
         gen_path = Path(f"{root}/{gen}")
+        if is_archive(gen_path):
+            population = read_generation(
+                gen_path, distributions, root, method="dask"
+            )
+            pop_history.append(population)
+            continue
+
+        population = []
         for ind_dir in sorted(
             gen_path.glob("*"), key=lambda path: int(path.stem)
         ):
@@ -1,6 +1,7 @@
 """ Functions for the creation and updating of a population. """
 
 from .individual import create_individual
+from .metadata import MetadataBank
 from .operators import crossover, mutation
 
 
@@ -25,9 +26,8 @@ def create_initial_population(
         Relative weights with which to sample from ``families``. If ``None``,
         sampling is done uniformly.
     random_states : dict
-        A mapping of the index of the population to a
-        ``numpy.random.RandomState`` instance that is to be assigned to the
-        individual at that index in the population.
+        A mapping of the index of the population to a PRNG that is to be
+        assigned to the individual at that index in the population.
 
     Returns
     -------
@@ -44,7 +44,7 @@ def create_initial_population(
 
 
 def create_new_population(
-    parents,
+    parent_idxs,
     population,
     crossover_prob,
     mutation_prob,
@@ -53,16 +53,25 @@ def create_new_population(
     families,
     weights,
     random_states,
+    bank=None,
 ):
     """Given a set of potential parents to be carried into the next generation,
     create offspring from pairs within that set until there are enough
-    individuals.
+    individuals. An individual may be selected as a parent more than once, in
+    which case it is carried over once but is more likely to be bred from.
+
+    The family of each column of the parents is taken from one
+    ``MetadataBank`` of them for the whole generation. Every offspring is
+    created by crossover before any are mutated, so that the number of columns
+    of each family in all of them can also be found at once. Crossover does
+    not use the PRNGs of the families, so this gives the same offspring as
+    mutating each one in turn.
 
     Parameters
     ----------
-    parents : list
-        A list of `edo.individual.Individual` instances used to create new
-        offspring.
+    parent_idxs : list
+        The indices in ``population`` of the individuals used to create new
+        offspring, as given by ``edo.operators.selection``. These may repeat.
     population : list
         The current population.
     crossover_prob : float
@@ -81,25 +90,53 @@ def create_new_population(
         Weights used to sample elements from ``families``.
     random_states : dict
         The PRNGs assigned to each individual in the population.
+    bank : edo.metadata.MetadataBank, optional
+        A bank of the metadata of the parents, in the order of
+        ``parent_idxs`` and indexed by ``families``. If ``None``, one is
+        built.
     """
 
-    parent_idxs = [population.index(parent) for parent in parents]
+    parents = [population[i] for i in parent_idxs]
+    carried_idxs = dict.fromkeys(parent_idxs)
     available_states = [
-        state for i, state in random_states.items() if i not in parent_idxs
+        state for i, state in random_states.items() if i not in carried_idxs
     ]
 
-    new_population = parents
+    if bank is None:
+        bank = MetadataBank.from_individuals(parents, families)
+
+    parent_codes = bank.get_family_codes()
+
+    offspring = []
     for state in available_states:
         parent1_idx, parent2_idx = state.choice(len(parents), size=2)
         parents_ = parents[parent1_idx], parents[parent2_idx]
-        offspring = crossover(
-            *parents_, col_limits, families, state, crossover_prob
+        family_codes = parent_codes[parent1_idx], parent_codes[parent2_idx]
+        offspring.append(
+            crossover(
+                *parents_,
+                col_limits,
+                families,
+                state,
+                crossover_prob,
+                family_codes,
+            )
         )
+
+    offspring_bank = MetadataBank.from_individuals(offspring, families)
+    family_counts = offspring_bank.get_family_counts()
+
+    new_population = [population[i] for i in carried_idxs]
+    for individual, counts in zip(offspring, family_counts):
         mutant = mutation(
-            offspring, mutation_prob, row_limits, col_limits, families, weights
+            individual,
+            mutation_prob,
+            row_limits,
+            col_limits,
+            families,
+            weights,
+            dict(zip(families, counts.tolist())),
         )
-        for col, meta in zip(*mutant):
-            mutant.dataframe[col] = mutant.dataframe[col].astype(meta.dtype)
         new_population.append(mutant)
 
     return new_population
@@ -0,0 +1,98 @@
+""" Functions for handling both kinds of ``numpy`` PRNG. """
+
+import numpy as np
+
+MAX_SEED = np.iinfo(np.int32).max
+
+
+def get_random_state(random_state=None):
+    """Get a PRNG from ``random_state``. Instances of
+    ``numpy.random.Generator`` and ``numpy.random.RandomState`` are used as
+    they are, while an integer seed or a ``numpy.random.SeedSequence`` is used
+    to create a new ``Generator``. If ``random_state`` is ``None`` then the
+    global ``numpy`` PRNG is used."""
+
+    if isinstance(random_state, (np.random.Generator, np.random.RandomState)):
+        return random_state
+
+    if isinstance(random_state, (int, np.integer, np.random.SeedSequence)):
+        return np.random.default_rng(random_state)
+
+    return np.random.mtrand._rand
+
+
+def integers(random_state, low, high=None, size=None):
+    """Sample integers from the half-open interval ``[low, high)`` with
+    ``random_state``, whichever kind of PRNG it is. As with ``numpy``, the
+    interval is ``[0, low)`` if ``high`` is ``None``."""
+
+    if isinstance(random_state, np.random.Generator):
+        return random_state.integers(low, high, size=size)
+
+    return random_state.randint(low, high, size=size)
+
+
+def spawn(random_state, n):
+    """Create ``n`` new PRNGs of the same kind as ``random_state`` from the
+    children of a ``numpy.random.SeedSequence``, so that their streams are
+    independent of one another rather than seeded from integers that could
+    collide. A ``Generator`` spawns them from its own seed sequence if it has
+    one. Otherwise, the seed sequence is made from entropy that
+    ``random_state`` samples."""
+
+    children = _get_seed_sequence(random_state).spawn(n)
+    if isinstance(random_state, np.random.Generator):
+        return [np.random.default_rng(child) for child in children]
+
+    return [
+        np.random.RandomState(np.random.MT19937(child)) for child in children
+    ]
+
+
+def _get_seed_sequence(random_state):
+    """Get the seed sequence to spawn new PRNGs from. This is the one behind
+    the bit generator of ``random_state`` where there is one, and a new one
+    from four integers sampled with ``random_state`` otherwise. Versions of
+    ``numpy`` before 1.25 only keep it as the private ``_seed_seq``."""
+
+    bit_generator = getattr(random_state, "bit_generator", None)
+    seed_seq = getattr(bit_generator, "seed_seq", None)
+    if seed_seq is None:
+        seed_seq = getattr(bit_generator, "_seed_seq", None)
+    if isinstance(seed_seq, np.random.SeedSequence):
+        return seed_seq
+
+    entropy = integers(random_state, MAX_SEED, size=4)
+    return np.random.SeedSequence([int(value) for value in entropy])
+
+
+def get_entropy(random_state=None):
+    """Get the entropy of a run from ``random_state``. An integer seed or the
+    entropy of a ``numpy.random.SeedSequence`` is used as it is. Otherwise,
+    the entropy is sampled from the PRNG given by ``random_state``."""
+
+    if isinstance(random_state, np.random.SeedSequence):
+        return random_state.entropy
+
+    if isinstance(random_state, (int, np.integer)):
+        return int(random_state)
+
+    return int(integers(get_random_state(random_state), MAX_SEED))
+
+
+def get_stream(entropy, generation, slot):
+    """Get the PRNG for ``slot`` in ``generation`` of a run with ``entropy``.
+    The stream is a ``numpy.random.Generator`` on a counter-based ``Philox``
+    bit generator whose key is derived from all three numbers alone, so it
+    does not depend on any other stream or on the order in which the streams
+    are used."""
+
+    seed = np.random.SeedSequence(entropy, spawn_key=(generation, slot))
+    return np.random.Generator(np.random.Philox(seed))
+
+
+def get_streams(entropy, generation, size):
+    """Get a dictionary mapping each slot in a population of ``size``
+    individuals to its PRNG in ``generation``."""
+
+    return {slot: get_stream(entropy, generation, slot) for slot in range(size)}
@@ -0,0 +1,328 @@
+""" A columnar storage layer for the dataset of an individual. """
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnStore:
+    """A column-oriented store for the values of a dataset. Each column is held
+    in its own array, or buffer, which may have spare rows at its end. Like a
+    growable vector, rows are appended into this spare capacity and the
+    buffers are only reallocated (geometrically) when they are full. Removing
+    a row swaps the last row into its place so nothing needs to be shifted.
+
+    Buffers can be shared between stores. A shared buffer is read-only and is
+    only copied by a store when it first writes to that column, so inherited
+    columns cost nothing until they are changed. A shared buffer lives for as
+    long as any store refers to it.
+
+    Boolean columns are packed eight rows to a byte with ``numpy.packbits``.
+    Packed columns are read and written bit by bit, and are only unpacked when
+    their values are asked for as a whole.
+
+    Parameters
+    ----------
+    buffers : list
+        A list of one-dimensional arrays, one for each column. Each buffer must
+        have at least ``nrows`` elements, the first ``nrows`` of which are the
+        values of the column. The buffers are used as they are, not copied.
+    nrows : int
+        The number of rows in the dataset.
+    packed : list, optional
+        Whether each buffer holds a boolean column as an array of bytes packed
+        with ``numpy.packbits``, in which case it must have at least ``nrows``
+        bits. No column is packed by default.
+
+    Attributes
+    ----------
+    nrows : int
+        The number of rows currently in the dataset.
+    """
+
+    def __init__(self, buffers, nrows, packed=None):
+
+        self._buffers = list(buffers)
+        self._packed = list(packed or [False] * len(self._buffers))
+        self.nrows = nrows
+
+    def __repr__(self):
+
+        return f"ColumnStore(nrows={self.nrows}, ncols={self.ncols})"
+
+    @property
+    def ncols(self):
+        """ The number of columns currently in the dataset. """
+
+        return len(self._buffers)
+
+    @property
+    def shape(self):
+        """ The number of rows and columns in the dataset. """
+
+        return self.nrows, self.ncols
+
+    @classmethod
+    def from_dataframe(cls, dataframe):
+        """Create a store from the columns of ``dataframe``, copying them into
+        buffers with some spare capacity."""
+
+        nrows = len(dataframe)
+        capacity = _get_capacity(nrows)
+
+        buffers, packed = [], []
+        for col in dataframe.columns:
+            values = dataframe[col].to_numpy()
+            buffers.append(_get_buffer(values, capacity))
+            packed.append(values.dtype == bool)
+
+        return cls(buffers, nrows, packed)
+
+    @classmethod
+    def empty(cls, dtypes, nrows):
+        """Create a store of uninitialised columns with the given datatypes by
+        preallocating one column-major block for each distinct datatype. The
+        buffers of the store are views on these blocks. Boolean columns are
+        packed into buffers of their own. A datatype of ``None`` leaves a
+        column without a buffer so that it can be linked to the column of
+        another store with ``link``."""
+
+        capacity = _get_capacity(nrows)
+        dtypes = [
+            None if dtype is None else np.dtype(dtype) for dtype in dtypes
+        ]
+        packed = [dtype == bool for dtype in dtypes]
+
+        buffers = [None] * len(dtypes)
+        for j in np.flatnonzero(packed):
+            buffers[j] = np.zeros(_get_nbytes(capacity), dtype=np.uint8)
+
+        for dtype in dict.fromkeys(dtypes):
+            if dtype is None or dtype == bool:
+                continue
+
+            positions = [j for j, dtyp in enumerate(dtypes) if dtyp == dtype]
+            block = np.empty((capacity, len(positions)), dtype, order="F")
+            for k, j in enumerate(positions):
+                buffers[j] = block[:, k]
+
+        return cls(buffers, nrows, packed)
+
+    def is_packed(self, j):
+        """ Determine whether column ``j`` is packed into bits. """
+
+        return self._packed[j]
+
+    def dtype(self, j):
+        """ The datatype of the values in column ``j``. """
+
+        if self._packed[j]:
+            return np.dtype(bool)
+
+        return self._buffers[j].dtype
+
+    def column(self, j):
+        """Get a view of the values in column ``j``. This view is read-only if
+        the column is shared with another store. A packed column is unpacked
+        into a new array instead, so it can only be written to with
+        ``set_column`` or ``update``."""
+
+        buffer = self._buffers[j]
+        if self._packed[j]:
+            return np.unpackbits(buffer, count=self.nrows).view(bool)
+
+        return buffer[: self.nrows]
+
+    def set_column(self, j, values):
+        """ Overwrite all of the values of column ``j``. """
+
+        buffer = self._own(j)
+        if self._packed[j]:
+            bits = np.packbits(np.asarray(values, dtype=bool))
+            buffer[: len(bits)] = bits
+        else:
+            buffer[: self.nrows] = values
+
+    def take(self, j, rows):
+        """Get the values of column ``j`` at ``rows``. Packed columns are read
+        bit by bit without being unpacked."""
+
+        if self._packed[j]:
+            rows = np.asarray(rows, dtype=int)
+            bits = self._buffers[j][rows >> 3] >> (7 - (rows & 7))
+            return (bits & 1).astype(bool)
+
+        return self.column(j)[rows]
+
+    def share(self, j):
+        """Get the buffer of column ``j`` to be used by another store. The
+        buffer is made read-only, so whichever store writes to the column
+        first makes its own copy."""
+
+        buffer = self._buffers[j]
+        buffer.flags.writeable = False
+
+        return buffer
+
+    def link(self, j, other, k):
+        """Make column ``j`` refer to the buffer of column ``k`` in ``other``
+        rather than copying it. Both stores must have the same number of
+        rows."""
+
+        self._buffers[j] = other.share(k)
+        self._packed[j] = other.is_packed(k)
+
+    def update(self, j, rows, values):
+        """Overwrite the values of column ``j`` at ``rows``, which may be
+        distinct indices or a boolean mask. The bits of a packed column are
+        cleared and set in place."""
+
+        buffer = self._own(j)
+        if not self._packed[j]:
+            buffer[: self.nrows][rows] = values
+            return
+
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+
+        values = np.broadcast_to(np.asarray(values, dtype=bool), rows.shape)
+        positions = rows >> 3
+        masks = (0x80 >> (rows & 7)).astype(np.uint8)
+
+        np.bitwise_and.at(buffer, positions, ~masks)
+        np.bitwise_or.at(buffer, positions[values], masks[values])
+
+    def append_row(self, values):
+        """Append a row of ``values`` to the end of the dataset, growing the
+        buffers if they are full."""
+
+        for j, value in enumerate(values):
+            capacity = self._get_row_capacity(j)
+            if capacity <= self.nrows:
+                buffer = self._reallocate(j, _get_capacity(capacity))
+            else:
+                buffer = self._own(j)
+
+            if self._packed[j]:
+                _set_bit(buffer, self.nrows, value)
+            else:
+                buffer[self.nrows] = value
+
+        self.nrows += 1
+
+    def remove_row(self, i):
+        """Remove row ``i`` from the dataset by moving the last row into its
+        place. The order of the remaining rows is not preserved."""
+
+        last = self.nrows - 1
+        for j in range(self.ncols):
+            buffer = self._own(j)
+            if self._packed[j]:
+                _set_bit(buffer, i, _get_bit(buffer, last))
+            else:
+                buffer[i] = buffer[last]
+
+        self.nrows = last
+
+    def append_column(self, values):
+        """Add ``values`` as a new column at the end of the dataset. Boolean
+        values are packed."""
+
+        values = np.asarray(values)
+        self._buffers.append(_get_buffer(values, _get_capacity(self.nrows)))
+        self._packed.append(values.dtype == bool)
+
+    def remove_column(self, j):
+        """ Remove column ``j`` from the dataset. """
+
+        self._buffers.pop(j)
+        self._packed.pop(j)
+
+    def to_dataframe(self):
+        """Create a contiguous ``pandas.DataFrame`` from the values in the
+        store. The columns are labelled by their position."""
+
+        return pd.DataFrame(
+            {j: self.column(j) for j in range(self.ncols)},
+            index=pd.RangeIndex(self.nrows),
+            copy=True,
+        )
+
+    def _own(self, j):
+        """Get a writeable buffer for column ``j``, copying it first if it is
+        shared with another store."""
+
+        buffer = self._buffers[j]
+        if not buffer.flags.writeable:
+            buffer = self._reallocate(j, _get_capacity(self.nrows))
+
+        return buffer
+
+    def _get_row_capacity(self, j):
+        """ Get the number of rows that the buffer of column ``j`` can hold. """
+
+        capacity = len(self._buffers[j])
+        if self._packed[j]:
+            capacity *= 8
+
+        return capacity
+
+    def _reallocate(self, j, capacity):
+        """Copy the values of column ``j`` into a new buffer that can hold
+        ``capacity`` rows."""
+
+        buffer = self._buffers[j]
+        if self._packed[j]:
+            new = np.zeros(_get_nbytes(capacity), dtype=np.uint8)
+            nbytes = _get_nbytes(self.nrows)
+            new[:nbytes] = buffer[:nbytes]
+        else:
+            new = np.empty(capacity, dtype=buffer.dtype)
+            new[: self.nrows] = buffer[: self.nrows]
+
+        self._buffers[j] = new
+
+        return new
+
+
+def _get_capacity(nrows):
+    """ Get the number of rows to allocate for a dataset of ``nrows`` rows. """
+
+    return nrows + nrows // 4 + 1
+
+
+def _get_nbytes(nrows):
+    """ Get the number of bytes needed to pack ``nrows`` bits. """
+
+    return (nrows + 7) // 8
+
+
+def _get_buffer(values, capacity):
+    """Copy ``values`` into a new buffer that can hold ``capacity`` rows,
+    packing them if they are boolean."""
+
+    if values.dtype == bool:
+        buffer = np.zeros(_get_nbytes(capacity), dtype=np.uint8)
+        bits = np.packbits(values)
+        buffer[: len(bits)] = bits
+    else:
+        buffer = np.empty(capacity, dtype=values.dtype)
+        buffer[: len(values)] = values
+
+    return buffer
+
+
+def _get_bit(buffer, i):
+    """ Get bit ``i`` of a packed buffer. """
+
+    return bool(buffer[i >> 3] >> (7 - (i & 7)) & 1)
+
+
+def _set_bit(buffer, i, value):
+    """ Set bit ``i`` of a packed buffer to ``value``. """
+
+    mask = 0x80 >> (i & 7)
+    if value:
+        buffer[i >> 3] |= mask
+    else:
+        buffer[i >> 3] &= ~mask & 0xFF
@@ -1,11 +1,14 @@
 """ Test base distribution class and the methods shared by all pdf classes. """
 
+import pickle
+
 import numpy as np
 import pytest
 from hypothesis import given
 from hypothesis.strategies import integers, sampled_from
 
-from edo.distributions import Distribution, all_distributions
+from edo.distributions import Distribution, Normal, all_distributions
+from edo.distributions.base import sample_into
 
 
 def test_distribution_instantiation():
@@ -79,3 +82,107 @@ def test_sample(distribution, nrows, seed):
     sample = pdf.sample(nrows, state)
     assert sample.shape == (nrows,)
     assert sample.dtype == pdf.dtype
+
+
+@given(
+    distribution=sampled_from(all_distributions),
+    kind=sampled_from([np.random.default_rng, np.random.RandomState]),
+    nrows=integers(min_value=1, max_value=100),
+    seed=integers(min_value=0, max_value=100),
+)
+def test_sample_out(distribution, kind, nrows, seed):
+    """Verify that distribution objects can sample into a given array and that
+    this gives the same values as sampling a new array."""
+
+    pdf = distribution(kind(seed))
+    expected = pdf.sample(nrows, kind(seed))
+
+    out = np.empty(nrows, dtype=pdf.dtype)
+    sample = pdf.sample(nrows, kind(seed), out=out)
+
+    assert sample is out
+    assert np.array_equal(sample, expected)
+
+
+class NoOut(Distribution):
+    """ A user-defined distribution whose sample method does not take out. """
+
+    name = "NoOut"
+    dtype = float
+
+    def sample(self, nrows, random_state):
+
+        return random_state.random(nrows)
+
+
+@given(
+    nrows=integers(min_value=1, max_value=100),
+    seed=integers(min_value=0, max_value=100),
+)
+def test_sample_into(nrows, seed):
+    """Verify that a sample is written into a given array whether or not the
+    distribution supports it, and that a new array is returned otherwise."""
+
+    for pdf in (NoOut(), Normal(np.random.default_rng(seed))):
+        expected = pdf.sample(nrows, np.random.default_rng(seed))
+        sample = sample_into(pdf, nrows, np.random.default_rng(seed))
+        assert np.array_equal(sample, expected)
+
+        out = np.empty(nrows)
+        sample = sample_into(pdf, nrows, np.random.default_rng(seed), out)
+        assert sample is out
+        assert np.array_equal(sample, expected)
+
+
+@given(
+    distribution=sampled_from(all_distributions),
+    size=integers(min_value=1, max_value=10),
+    seed=integers(min_value=0, max_value=100),
+)
+def test_draw(distribution, size, seed):
+    """Verify that drawing without a buffer is the same as sampling."""
+
+    pdf = distribution(np.random.default_rng(seed))
+
+    value = pdf.draw(np.random.default_rng(seed))
+    assert value == pdf.sample(1, np.random.default_rng(seed))[0]
+
+    values = pdf.draw(np.random.default_rng(seed), size)
+    assert np.array_equal(values, pdf.sample(size, np.random.default_rng(seed)))
+
+
+@given(
+    distribution=sampled_from(all_distributions),
+    buffer_size=integers(min_value=1, max_value=20),
+    ndraws=integers(min_value=1, max_value=50),
+    seed=integers(min_value=0, max_value=100),
+)
+def test_draw_buffered(distribution, buffer_size, ndraws, seed):
+    """Verify that buffered draws are served from blocks sampled with the PRNG
+    that asks for them, and that the buffer is left out of the parameters and
+    pickles of an instance."""
+
+    distribution.buffer_size = buffer_size
+    try:
+        pdf = distribution(np.random.default_rng(seed))
+        params = pdf.get_params()
+
+        state = np.random.default_rng(seed)
+        draws = [pdf.draw(state) for _ in range(ndraws)]
+
+        other = np.random.default_rng(seed)
+        nblocks = -(-ndraws // buffer_size)
+        expected = np.concatenate(
+            [pdf.sample(buffer_size, other) for _ in range(nblocks)]
+        )
+        assert np.array_equal(draws, expected[:ndraws])
+
+        value = pdf.draw(np.random.default_rng(seed + 1))
+        block = pdf.sample(buffer_size, np.random.default_rng(seed + 1))
+        assert value == block[0]
+
+        assert pdf.get_params() == params
+        assert not hasattr(pickle.loads(pickle.dumps(pdf)), "_buffer")
+
+    finally:
+        distribution.buffer_size = None
@@ -24,12 +24,16 @@ def test_gamma_set_param_limits(first_limits, second_limits, seed):
     """Check that a Gamma object can sample its parameters correctly if its
     class attributes are altered."""
 
+    default_limits = Gamma.param_limits
     Gamma.param_limits = {"alpha": first_limits, "theta": second_limits}
 
-    state = np.random.RandomState(seed)
-    gamma = Gamma(state)
-    assert first_limits[0] <= gamma.alpha <= first_limits[1]
-    assert second_limits[0] <= gamma.theta <= second_limits[1]
+    try:
+        state = np.random.RandomState(seed)
+        gamma = Gamma(state)
+        assert first_limits[0] <= gamma.alpha <= first_limits[1]
+        assert second_limits[0] <= gamma.theta <= second_limits[1]
+    finally:
+        Gamma.param_limits = default_limits
 
 
 @CONTINUOUS
@@ -37,13 +41,17 @@ def test_normal_set_param_limits(first_limits, second_limits, seed):
     """Check that a Normal object can sample its parameters correctly if its
     class attributes are altered."""
 
+    default_limits = Normal.param_limits
     Normal.param_limits = {"mean": first_limits, "std": second_limits}
 
-    np.random.seed(seed)
-    state = np.random.RandomState(seed)
-    normal = Normal(state)
-    assert first_limits[0] <= normal.mean <= first_limits[1]
-    assert second_limits[0] <= normal.std <= second_limits[1]
+    try:
+        np.random.seed(seed)
+        state = np.random.RandomState(seed)
+        normal = Normal(state)
+        assert first_limits[0] <= normal.mean <= first_limits[1]
+        assert second_limits[0] <= normal.std <= second_limits[1]
+    finally:
+        Normal.param_limits = default_limits
 
 
 @CONTINUOUS
@@ -51,9 +59,13 @@ def test_uniform_set_param_limits(first_limits, second_limits, seed):
     """Check that a Uniform object can sample its parameters correctly if its
     class attributes are altered."""
 
+    default_limits = Uniform.param_limits
     Uniform.param_limits = {"bounds": first_limits}
 
-    state = np.random.RandomState(seed)
-    uniform = Uniform(state)
-    for bound in uniform.bounds:
-        assert first_limits[0] <= bound <= first_limits[1]
+    try:
+        state = np.random.RandomState(seed)
+        uniform = Uniform(state)
+        for bound in uniform.bounds:
+            assert first_limits[0] <= bound <= first_limits[1]
+    finally:
+        Uniform.param_limits = default_limits
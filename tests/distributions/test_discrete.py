@@ -25,11 +25,15 @@ def test_bernoulli_set_param_limits(prob_limits, seed):
     """Check that a Bernoulli object can sample its parameters correctly if its
     class attributes are altered."""
 
+    default_limits = Bernoulli.param_limits
     Bernoulli.param_limits = {"prob": prob_limits}
 
-    state = np.random.RandomState(seed)
-    bernoulli = Bernoulli(state)
-    assert prob_limits[0] <= bernoulli.prob <= prob_limits[1]
+    try:
+        state = np.random.RandomState(seed)
+        bernoulli = Bernoulli(state)
+        assert prob_limits[0] <= bernoulli.prob <= prob_limits[1]
+    finally:
+        Bernoulli.param_limits = default_limits
 
 
 @given(lam_limits=LIMITS, seed=integers(min_value=0, max_value=2 ** 32 - 1))
@@ -37,8 +41,12 @@ def test_poisson_set_param_limits(lam_limits, seed):
     """Check that a Poisson object can sample its parameters correctly if its
     class attributes are altered."""
 
+    default_limits = Poisson.param_limits
     Poisson.param_limits = {"lam": lam_limits}
 
-    state = np.random.RandomState(seed)
-    poisson = Poisson(state)
-    assert lam_limits[0] <= poisson.lam <= lam_limits[1]
+    try:
+        state = np.random.RandomState(seed)
+        poisson = Poisson(state)
+        assert lam_limits[0] <= poisson.lam <= lam_limits[1]
+    finally:
+        Poisson.param_limits = default_limits
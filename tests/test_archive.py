@@ -0,0 +1,64 @@
+""" Tests for the archive of a generation. """
+
+import os
+from pathlib import Path
+
+import numpy as np
+from hypothesis import settings
+
+from edo import Family
+from edo.archive import (
+    is_archive,
+    read_generation,
+    read_individual,
+    read_records,
+    write_generation,
+)
+from edo.distributions import Bernoulli, Normal, Poisson
+from edo.population import create_initial_population
+
+from .util.parameters import POPULATION
+
+
+@POPULATION
+@settings(deadline=None, max_examples=20)
+def test_write_and_read_generation(size, row_limits, col_limits, weights):
+    """Test that a generation can be written to a single archive and that
+    each individual can be read back from it exactly, by itself or with the
+    rest of the generation."""
+
+    path = Path(".testcache/0")
+    distributions = [Bernoulli, Normal, Poisson]
+    families = [
+        Family(Bernoulli, dtype_policy="compact"),
+        Family(Normal, dtype_policy="compact"),
+        Family(Poisson),
+    ]
+    states = {i: np.random.default_rng(i) for i in range(size)}
+
+    population = create_initial_population(
+        row_limits, col_limits, families, weights, states
+    )
+    for family in families:
+        family.save(".testcache")
+
+    assert not is_archive(path)
+    write_generation(population, path)
+    assert is_archive(path)
+    assert sorted(os.listdir(path)) == ["population.data", "population.meta"]
+    assert len(read_records(path)) == size
+
+    generation = read_generation(path, distributions, ".testcache")
+    for idx, (individual, read) in enumerate(zip(population, generation)):
+        alone = read_individual(path, idx, distributions, ".testcache")
+        for other in (read, alone):
+            assert other.dataframe.equals(individual.dataframe)
+            assert [pdf.to_dict() for pdf in other.metadata] == [
+                pdf.to_dict() for pdf in individual.metadata
+            ]
+            assert (
+                other.random_state.bit_generator.state
+                == individual.random_state.bit_generator.state
+            )
+
+    os.system("rm -r .testcache")
@@ -2,12 +2,15 @@
 
 import numpy as np
 import pandas as pd
-from hypothesis import settings
+from hypothesis import given, settings
+from hypothesis.strategies import integers
 
 from edo import Family
 from edo.distributions import Gamma, Normal, Poisson
 from edo.individual import Individual, create_individual
 from edo.operators import crossover
+from edo.operators.crossover import _adjust_column_lengths
+from edo.storage import ColumnStore
 
 from .util.parameters import (
     INTEGER_CROSSOVER,
@@ -135,3 +138,48 @@ def test_tuple_limits(row_limits, col_limits, weights, prob, seed):
     for i, family in enumerate(families):
         count = sum(pdf.family is family for pdf in individual.metadata)
         assert col_limits[0][i] <= count <= col_limits[1][i]
+
+
+@given(
+    nrows=integers(min_value=1, max_value=50),
+    longest=integers(min_value=1, max_value=50),
+    seed=integers(min_value=0, max_value=100),
+)
+def test_adjust_column_lengths(nrows, longest, seed):
+    """Verify that columns are trimmed with the same rows and filled from
+    their distributions to give a store of the right shape and datatypes."""
+
+    random_state = np.random.RandomState(seed)
+    families = [Family(Normal), Family(Poisson)]
+    metadata = [family.make_instance(random_state) for family in families] * 2
+
+    columns = [
+        np.arange(longest, dtype=float),
+        np.arange(longest),
+        np.arange(nrows, dtype=float),
+        np.arange(max(nrows - longest, 1)),
+    ]
+
+    sources = []
+    for column in columns:
+        source = ColumnStore.empty([column.dtype], len(column))
+        source.set_column(0, column)
+        sources.append((source, 0))
+
+    store = _adjust_column_lengths(sources, metadata, nrows, random_state)
+    assert store.shape == (nrows, len(columns))
+
+    for j, column in enumerate(columns):
+        values = store.column(j)
+        assert values.dtype == column.dtype
+
+        if len(column) > nrows:
+            assert np.array_equal(values, store.column(0))
+            assert np.all(np.diff(values) > 0)
+        else:
+            assert np.array_equal(values[: len(column)], column)
+
+        parent_values = sources[j][0].column(0)
+        shared = len(column) == nrows
+        assert np.shares_memory(values, parent_values) is shared
+        assert values.flags.writeable is not shared
@@ -0,0 +1,120 @@
+""" Tests for the column datatype policies. """
+
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis.strategies import floats, sampled_from
+
+from edo.distributions import Bernoulli, Poisson, all_distributions
+from edo.distributions.base import Distribution
+from edo.dtypes import DTYPE_POLICIES, compact, default, get_dtype
+
+
+@given(distribution=sampled_from(all_distributions))
+def test_default(distribution):
+    """ Test that the default policy uses the preferred datatype. """
+
+    param_limits = distribution.param_limits
+    dtype = get_dtype(distribution, param_limits)
+
+    assert dtype == np.dtype(distribution.dtype)
+    assert dtype == default(distribution, param_limits)
+    assert DTYPE_POLICIES["default"] is default
+
+
+@given(distribution=sampled_from(all_distributions))
+def test_compact(distribution):
+    """Test that the compact policy uses single-precision floats, booleans for
+    Bernoulli variables and the smallest integers that hold the values of the
+    distribution otherwise."""
+
+    param_limits = distribution.param_limits
+    dtype = get_dtype(distribution, param_limits, "compact")
+
+    assert dtype == compact(distribution, param_limits)
+    if np.dtype(distribution.dtype).kind == "f":
+        assert dtype == np.float32
+    elif distribution is Bernoulli:
+        assert dtype == bool
+    else:
+        assert dtype == np.int8
+
+        lower, upper = distribution.get_value_limits(param_limits)
+        assert np.iinfo(dtype).min <= lower
+        assert np.iinfo(dtype).max >= upper
+
+
+@given(lam=floats(min_value=0, max_value=1e6))
+def test_compact_poisson(lam):
+    """Test that the compact datatype of a Poisson column grows with its rate
+    and holds a large sample."""
+
+    param_limits = {"lam": [0, lam]}
+    dtype = get_dtype(Poisson, param_limits, "compact")
+
+    _, upper = Poisson.get_value_limits(param_limits)
+    assert upper >= lam
+    assert np.iinfo(dtype).max >= upper
+
+    sample = np.random.default_rng(0).poisson(lam, size=1000)
+    assert sample.max() <= np.iinfo(dtype).max
+
+
+class Flag(Distribution):
+    """ A distribution of boolean values without any limits on them. """
+
+    name = "Flag"
+    dtype = bool
+    param_limits = {"prob": [0, 1]}
+
+    def sample(self, nrows=None, random_state=None, out=None):
+
+        return random_state.random(size=nrows) < 0.5
+
+
+class Count(Flag):
+    """ A distribution of integers without any limits on them. """
+
+    name = "Count"
+    dtype = int
+
+    def sample(self, nrows=None, random_state=None, out=None):
+
+        return random_state.integers(10, size=nrows)
+
+
+class BigCount(Count):
+    """ A distribution of integers that may not fit in 64 bits. """
+
+    name = "BigCount"
+
+    @classmethod
+    def get_value_limits(cls, param_limits):
+
+        return 0, 2 ** 64
+
+
+def test_compact_fallbacks():
+    """Test that the compact policy keeps the preferred datatype of a
+    distribution that is neither float nor integer, of one without limits on
+    its values and of one whose values do not fit in any integer type."""
+
+    for distribution in (Flag, Count, BigCount):
+        dtype = compact(distribution, distribution.param_limits)
+        assert dtype == np.dtype(distribution.dtype)
+
+    assert Count.get_value_limits(Count.param_limits) is None
+
+
+def test_custom_policy():
+    """ Test that a function can be used as a policy. """
+
+    dtype = get_dtype(Bernoulli, Bernoulli.param_limits, lambda *_: bool)
+    assert dtype == np.bool_
+
+
+def test_unknown_policy():
+    """ Test that an unknown policy name raises an error naming the others. """
+
+    with pytest.raises(ValueError, match="'compact', 'default'"):
+        get_dtype(Bernoulli, Bernoulli.param_limits, "smallest")
@@ -2,13 +2,16 @@
 
 import os
 import pathlib
+import pickle
 
 import numpy as np
 from hypothesis import given, settings
-from hypothesis.strategies import composite, integers, sampled_from
+from hypothesis.strategies import composite, integers, just, sampled_from
 
 from edo import Family
 from edo.distributions import all_distributions
+from edo.dtypes import DTYPE_POLICIES, compact
+from edo.family import Subtype, _read_index
 
 
 @composite
@@ -34,10 +37,12 @@ def test_init(distribution):
 
     assert family.distribution is distribution
     assert family.max_subtypes is None
+    assert family.dtype_policy == "default"
     assert family.name == distribution.name + "Family"
     assert family.subtype_id == 0
     assert family.subtypes == {}
     assert family.all_subtypes == {}
+    assert family.dirty_subtypes == set()
     assert family.random_state is np.random.mtrand._rand
 
 
@@ -61,11 +66,15 @@ def test_add_subtype(distribution):
     subtype = family.subtypes.get(0)
 
     assert family.subtype_id == 1
-    assert issubclass(subtype, distribution)
-    assert subtype.__name__ == f"{distribution.name}Subtype"
+    assert isinstance(subtype, Subtype)
+    assert subtype.distribution is distribution
+    assert subtype.name == distribution.name
+    assert subtype.param_limits == distribution.param_limits
+    assert subtype.param_limits is not distribution.param_limits
     assert subtype.subtype_id == 0
     assert subtype.family is family
     assert subtype is family.all_subtypes.get(0)
+    assert family.dirty_subtypes == {0}
 
 
 @given(distribution=distributions(), state=states())
@@ -76,9 +85,101 @@ def test_make_instance(distribution, state):
     pdf = family.make_instance(state)
 
     assert family.subtype_id == 1
-    assert family.subtypes == {0: pdf.__class__}
-    assert isinstance(pdf, distribution)
-    assert isinstance(pdf, family.subtypes[0])
+    assert list(family.subtypes) == [0]
+    assert type(pdf) is distribution
+    assert pdf.family is family
+    assert pdf.subtype_id == 0
+    assert pdf.param_limits is family.subtypes[0].param_limits
+    assert pdf.dtype == np.dtype(distribution.dtype)
+    assert set(pdf.to_dict()["params"]) == set(pdf.get_params())
+
+
+@given(distribution=distributions(), state=states())
+def test_make_instance_compact(distribution, state):
+    """Test that the instances of a family with the compact datatype policy
+    have the compact datatype of their subtype, and that it is not one of
+    their parameters."""
+
+    family = Family(distribution, dtype_policy="compact")
+    pdf = family.make_instance(state)
+
+    assert pdf.dtype == family.subtypes[0].dtype
+    assert pdf.dtype.itemsize < np.dtype(distribution.dtype).itemsize
+    assert "dtype" not in pdf.get_params()
+
+    sample = pdf.sample(10, state, out=np.empty(10, dtype=pdf.dtype))
+    assert sample.dtype == pdf.dtype
+
+
+@given(
+    distribution=distributions(),
+    state=states(),
+    n=integers(0, 50),
+    max_subtypes=integers(1, 5) | just(None),
+)
+def test_make_instances(distribution, state, n, max_subtypes):
+    """Test that several instances can be made at once without exceeding the
+    maximum number of subtypes."""
+
+    family = Family(distribution, max_subtypes)
+    family.random_state = np.random.RandomState(0)
+    pdfs = family.make_instances(n, state)
+
+    assert len(pdfs) == n
+    assert family.subtype_id == len(family.subtypes)
+    if max_subtypes is not None:
+        assert family.subtype_id <= max_subtypes
+
+    for pdf in pdfs:
+        assert type(pdf) is distribution
+        assert pdf.family is family
+        assert pdf.param_limits is family.subtypes[pdf.subtype_id].param_limits
+
+    assert set(pdf.subtype_id for pdf in pdfs) == set(family.subtypes)
+
+
+@given(distribution=distributions(), state=states())
+def test_update_subtype(distribution, state):
+    """Test that a subtype can be replaced by one with new parameter limits
+    without changing the instances that have already been made."""
+
+    family = Family(distribution)
+    pdf = family.make_instance(state)
+    family.save(".testcache")
+
+    old_limits = family.subtypes[0].param_limits
+    new_limits = {name: [0, 1] for name in old_limits}
+    subtype = family.update_subtype(0, new_limits)
+
+    assert subtype.param_limits == new_limits
+    assert family.subtypes[0] is subtype
+    assert family.all_subtypes[0] is subtype
+    assert family.dirty_subtypes == {0}
+    assert pdf.param_limits is old_limits
+
+    os.system("rm -r .testcache")
+
+
+@given(distribution=distributions(), state=states())
+def test_pickle_instance(distribution, state):
+    """Test that an instance of a subtype can be pickled without its family,
+    so that its pickle does not grow with the family."""
+
+    family = Family(distribution)
+    pdf = family.make_instance(state)
+    size = len(pickle.dumps(pdf))
+
+    for _ in range(50):
+        family.add_subtype()
+
+    pickled = pickle.loads(pickle.dumps(pdf))
+
+    assert len(pickle.dumps(pdf)) == size
+    assert type(pickled) is distribution
+    assert pickled.to_dict() == pdf.to_dict()
+    assert pickled.param_limits == pdf.param_limits
+    assert pickled.dtype == pdf.dtype
+    assert pickled.family is None
     assert pdf.family is family
 
 
@@ -107,13 +208,107 @@ def test_save(distribution):
     family.add_subtype()
     family.save(".testcache")
 
-    path = pathlib.Path(f".testcache/subtypes/{distribution.name}/")
-    assert (path / "0.pkl").exists()
-    assert (path / "state.pkl").exists()
+    path = pathlib.Path(f".testcache/subtypes/{distribution.name}.family")
+    assert path.exists()
+
+    with open(path, "rb") as file:
+        index, _ = _read_index(file)
+
+    assert set(index) == {"state", "dtype_policy", 0}
 
     os.system("rm -r .testcache")
 
 
+@given(distribution=distributions())
+@settings(deadline=None)
+def test_save_dirty_subtypes(distribution):
+    """Test that a family only writes the subtypes that have been created or
+    changed since it was last saved to the same place."""
+
+    family = Family(distribution)
+    family.add_subtype()
+    family.add_subtype()
+    family.save(".testcache")
+
+    path = pathlib.Path(f".testcache/subtypes/{distribution.name}.family")
+    with open(path, "rb") as file:
+        index, end = _read_index(file)
+
+    assert family.dirty_subtypes == set()
+    assert set(index) == {"state", "dtype_policy", 0, 1}
+
+    family.add_subtype()
+    family.dirty_subtypes.add(1)
+    family.save(".testcache")
+
+    with open(path, "rb") as file:
+        new_index, _ = _read_index(file)
+
+    assert set(new_index) == {"state", "dtype_policy", 0, 1, 2}
+    assert new_index[0] == index[0]
+    assert all(new_index[key] >= end for key in ("state", 1, 2))
+
+    family.save(".othercache")
+    other = pathlib.Path(f".othercache/subtypes/{distribution.name}.family")
+    with open(other, "rb") as file:
+        other_index, _ = _read_index(file)
+
+    assert set(other_index) == {"state", "dtype_policy", 0, 1, 2}
+    assert other.stat().st_size < path.stat().st_size
+
+    os.system("rm -r .testcache .othercache")
+
+
+@given(distribution=distributions())
+def test_merge_subtypes(distribution):
+    """Test that updated subtypes with identical parameter limits are merged
+    into the oldest of them, and that those that have not been updated are
+    left alone."""
+
+    family = Family(distribution)
+    for _ in range(4):
+        family.add_subtype()
+
+    param_limits = {
+        name: [limit - 1 for limit in limits]
+        for name, limits in family.subtypes[1].param_limits.items()
+    }
+    family.update_subtype(1, param_limits)
+    family.update_subtype(3, param_limits)
+
+    assert family.updated_subtypes == {1, 3}
+
+    merged = family.merge_subtypes()
+
+    assert merged == {3: 1}
+    assert list(family.subtypes) == [0, 1, 2]
+    assert list(family.all_subtypes) == [0, 1, 2, 3]
+    assert family.updated_subtypes == set()
+    assert family.merge_subtypes() == {}
+
+
+@given(distribution=distributions())
+def test_evict_subtypes(distribution):
+    """Test that only the oldest unused subtypes are evicted from the registry
+    of a family once it is too big."""
+
+    family = Family(distribution)
+    for _ in range(4):
+        family.add_subtype()
+
+    assert family.evict_subtypes([]) == []
+
+    family.registry_size = 2
+    family.subtypes = {3: family.subtypes[3]}
+
+    evicted = family.evict_subtypes([1])
+
+    assert evicted == [0, 2]
+    assert list(family.all_subtypes) == [1, 3]
+    assert family.dirty_subtypes == {1, 3}
+    assert family.evict_subtypes([1]) == []
+
+
 @given(distribution=distributions())
 def test_reset(distribution):
     """ Test that a family can reset itself. """
@@ -129,14 +324,18 @@ def test_reset(distribution):
 
 @given(distribution=distributions())
 def test_reset_cached(distribution):
-    """ Test that a family can remove any cached subtypes. """
+    """Test that a family can remove any cached subtypes, and that it can be
+    reset again once they are gone."""
 
     family = Family(distribution)
     family.add_subtype()
     family.save(".testcache")
     family.reset(".testcache")
 
-    path = pathlib.Path(f".testcache/subtypes/{distribution.name}")
+    path = pathlib.Path(f".testcache/subtypes/{distribution.name}.family")
+    assert not path.exists()
+
+    family.reset(".testcache")
     assert not path.exists()
 
 
@@ -157,8 +356,7 @@ def test_load(distribution):
     assert pickled.subtype_id == 1
     assert pickled.subtypes == {0: pickled_subtype}
 
-    assert issubclass(pickled_subtype, distribution)
-    assert pickled_subtype.__name__ == subtype.__name__
+    assert pickled_subtype.distribution is distribution
     assert pickled_subtype.name == subtype.name
     assert pickled_subtype.dtype == subtype.dtype
     assert pickled_subtype.subtype_id == 0
@@ -166,9 +364,6 @@ def test_load(distribution):
 
     assert pickled_subtype.hard_limits == subtype.hard_limits
     assert pickled_subtype.param_limits == subtype.param_limits
-    assert pickled_subtype.__init__ is subtype.__init__
-    assert pickled_subtype.__repr__ is subtype.__repr__
-    assert pickled_subtype.sample is subtype.sample
 
     for fpart, ppart in zip(
         family.random_state.get_state(), pickled.random_state.get_state()
@@ -181,6 +376,96 @@ def test_load(distribution):
     os.system("rm -r .testcache")
 
 
+@given(
+    distribution=distributions(),
+    dtype_policy=sampled_from(list(DTYPE_POLICIES)),
+)
+@settings(deadline=None)
+def test_load_dtype_policy(distribution, dtype_policy):
+    """Test that a family is loaded with the datatype policy it was saved
+    with, unless another policy is given."""
+
+    family = Family(distribution, dtype_policy=dtype_policy)
+    family.add_subtype()
+    family.save(".testcache")
+
+    pickled = Family.load(distribution, root=".testcache")
+
+    assert pickled.dtype_policy == dtype_policy
+    assert pickled.subtypes[0].dtype == family.subtypes[0].dtype
+
+    pickled = Family.load(distribution, ".testcache", dtype_policy=compact)
+
+    assert pickled.dtype_policy is compact
+    assert pickled.subtypes[0].dtype == compact(
+        distribution, family.subtypes[0].param_limits
+    )
+
+    family.dtype_policy = compact
+    family.save(".testcache")
+
+    pickled = Family.load(distribution, root=".testcache")
+
+    assert pickled.dtype_policy == "default"
+
+    os.system("rm -r .testcache")
+
+
+@given(distribution=distributions())
+@settings(deadline=None)
+def test_load_evicted(distribution):
+    """Test that a family keeps the identifiers of its subtypes when loaded
+    from a cache that is missing some of them."""
+
+    family = Family(distribution, registry_size=2)
+    for _ in range(3):
+        family.add_subtype()
+
+    family.subtypes.pop(1)
+    family.evict_subtypes([])
+    family.save(".testcache")
+
+    pickled = Family.load(distribution, root=".testcache")
+
+    assert list(pickled.subtypes) == [0, 2]
+    assert pickled.subtype_id == 3
+    for subtype_id, subtype in pickled.subtypes.items():
+        assert subtype.subtype_id == subtype_id
+
+    os.system("rm -r .testcache")
+
+
+@given(distribution=distributions())
+@settings(deadline=None)
+def test_save_evicted_elsewhere(distribution):
+    """Test that saving a family somewhere new carries over the subtypes that
+    it has evicted since it was last saved, so that they can still be loaded
+    from either place."""
+
+    family = Family(distribution, registry_size=2)
+    for _ in range(3):
+        family.add_subtype()
+
+    param_limits = {
+        subtype_id: subtype.param_limits
+        for subtype_id, subtype in family.all_subtypes.items()
+    }
+
+    family.save(".testcache")
+    family.subtypes.pop(1)
+    assert family.evict_subtypes([]) == [1]
+
+    for root in [".othercache", ".testcache"]:
+        family.save(root)
+
+        pickled = Family.load(distribution, root=root)
+        assert list(pickled.subtypes) == [0, 1, 2]
+        for subtype_id, subtype in pickled.subtypes.items():
+            assert subtype.param_limits == param_limits[subtype_id]
+
+    os.system("rm -r .testcache .othercache")
+
+
 @given(distribution=distributions())
 @settings(deadline=None)
 def test_load_more_than_ten(distribution):
@@ -201,9 +486,7 @@ def test_load_more_than_ten(distribution):
     assert list(pickled.subtypes.keys()) == list(range(11))
 
     for subtype_id, subtype in pickled.subtypes.items():
-        assert issubclass(subtype, distribution)
-        assert subtype.__init__ is distribution.__init__
-        assert subtype.sample is distribution.sample
+        assert subtype.distribution is distribution
         assert subtype.subtype_id == subtype_id
         assert subtype.family is pickled
 
@@ -10,6 +10,7 @@ from hypothesis.strategies import text
 
 from edo import Family
 from edo.distributions import Gamma, Normal, Poisson
+from edo.formats import FORMATS, get_format
 from edo.individual import Individual, create_individual
 
 from .util.parameters import (
@@ -188,3 +189,131 @@ def test_to_and_from_file(row_limits, col_limits, weights, seed):
             assert saved_part == state_part
 
     os.system("rm -r .testcache")
+
+
+@INTEGER_INDIVIDUAL
+@settings(deadline=None)
+def test_to_file_without_families(row_limits, col_limits, weights, seed):
+    """Test that an individual can be saved without saving its families."""
+
+    path = Path(".testcache/individual")
+
+    distributions = [Gamma, Normal, Poisson]
+    families = [Family(distribution) for distribution in distributions]
+
+    state = np.random.RandomState(seed)
+
+    individual = create_individual(
+        row_limits, col_limits, families, weights, state
+    )
+
+    individual.to_file(path, ".testcache", save_families=False)
+    assert (path / "main.csv").exists()
+    assert (path / "main.meta").exists()
+    assert not Path(".testcache/subtypes").exists()
+
+    os.system("rm -r .testcache")
+
+
+@INTEGER_INDIVIDUAL
+def test_store(row_limits, col_limits, weights, seed):
+    """Test that an individual has a columnar store matching its dataframe and
+    that an individual can be created from a store."""
+
+    distributions = [Gamma, Normal, Poisson]
+    families = [Family(distribution) for distribution in distributions]
+
+    state = np.random.RandomState(seed)
+
+    individual = create_individual(
+        row_limits, col_limits, families, weights, state
+    )
+
+    store = individual.store
+    assert store is individual.store
+    assert store.to_dataframe().equals(individual.dataframe)
+
+    new = Individual.from_store(store, individual.metadata, state)
+    assert new.store is store
+    assert new._dataframe is None
+    assert new.dataframe.equals(individual.dataframe)
+    assert new.dataframe is new.dataframe
+    _common_asserts(new, state, families)
+
+    individual.dataframe = individual.dataframe.iloc[:, :0]
+    assert individual.store is not store
+    assert individual.store.shape == (individual.dataframe.shape[0], 0)
+
+
+@INTEGER_INDIVIDUAL
+def test_columns_and_values(row_limits, col_limits, weights, seed):
+    """Test that the columns and values of an individual match its dataframe
+    and that they are taken from its store without building the
+    dataframe."""
+
+    distributions = [Gamma, Normal, Poisson]
+    families = [Family(distribution) for distribution in distributions]
+
+    state = np.random.RandomState(seed)
+
+    individual = create_individual(
+        row_limits, col_limits, families, weights, state
+    )
+
+    columns, values = individual.columns, individual.values
+    assert individual._dataframe is None
+
+    dataframe = individual.dataframe
+    assert len(columns) == dataframe.shape[1]
+    for column, col in zip(columns, dataframe.columns):
+        assert np.array_equal(column, dataframe[col].to_numpy())
+
+    assert values.shape == dataframe.shape
+    assert np.array_equal(values, dataframe.to_numpy())
+
+    other = Individual(dataframe, individual.metadata, state)
+    assert all(
+        np.array_equal(column, other_column)
+        for column, other_column in zip(columns, other.columns)
+    )
+    assert np.array_equal(other.values, values)
+
+
+@INTEGER_INDIVIDUAL
+@settings(deadline=None)
+def test_to_and_from_file_formats(row_limits, col_limits, weights, seed):
+    """Test that an individual can be saved to and created from file in each
+    format, that the format is found when reading, and that the binary
+    formats recover the dataset exactly."""
+
+    path = Path(".testcache/individual")
+
+    distributions = [Gamma, Normal, Poisson]
+    families = [Family(distribution) for distribution in distributions]
+
+    state = np.random.RandomState(seed)
+
+    individual = create_individual(
+        row_limits, col_limits, families, weights, state
+    )
+
+    for format, (filename, _, _) in FORMATS.items():
+        individual.to_file(path / format, ".testcache", format=format)
+        assert (path / format / filename).exists()
+        assert get_format(path / format) == format
+
+        for method in ("pandas", "dask"):
+            saved_individual = Individual.from_file(
+                path / format, distributions, ".testcache", method
+            )
+            dataframe = saved_individual.dataframe
+            if method == "dask":
+                dataframe = dataframe.compute()
+
+            expected = individual.dataframe
+            if format == "csv":
+                assert np.allclose(dataframe.values, expected.values)
+            else:
+                assert dataframe.equals(expected)
+
+    os.system("rm -r .testcache")
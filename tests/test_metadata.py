@@ -0,0 +1,155 @@
+""" Tests for the columnar index of metadata. """
+
+import numpy as np
+
+from edo import Family
+from edo.distributions import Gamma, Normal, Uniform
+from edo.metadata import MetadataBank
+from edo.operators.util import get_family_counts
+from edo.population import create_initial_population
+
+from .util.parameters import POPULATION
+
+
+def _make_population(size, row_limits, col_limits, weights):
+    """ Make a population of individuals and the families they use. """
+
+    distributions = [Gamma, Normal, Uniform]
+    families = [Family(distribution) for distribution in distributions]
+    states = {i: np.random.RandomState(i) for i in range(size)}
+
+    population = create_initial_population(
+        row_limits, col_limits, families, weights, states
+    )
+
+    return population, families
+
+
+@POPULATION
+def test_init(size, row_limits, col_limits, weights):
+    """Test that a bank records the owner, family and subtype of every column
+    in the order they appear."""
+
+    population, families = _make_population(
+        size, row_limits, col_limits, weights
+    )
+    bank = MetadataBank.from_individuals(population, families)
+    pdfs = [pdf for individual in population for pdf in individual.metadata]
+
+    assert repr(bank) == (
+        f"MetadataBank(individuals={size}, columns={len(pdfs)})"
+    )
+    assert bank.families == families
+    assert list(bank.owners) == [
+        i
+        for i, individual in enumerate(population)
+        for _ in individual.metadata
+    ]
+    assert list(bank.family_codes) == [
+        families.index(pdf.family) for pdf in pdfs
+    ]
+    assert list(bank.subtype_ids) == [pdf.subtype_id for pdf in pdfs]
+
+
+@POPULATION
+def test_discover_families(size, row_limits, col_limits, weights):
+    """Test that a bank adds any families it was not given in the order it
+    finds them."""
+
+    population, _ = _make_population(size, row_limits, col_limits, weights)
+    bank = MetadataBank.from_individuals(population)
+
+    found = []
+    for individual in population:
+        for pdf in individual.metadata:
+            if pdf.family not in found:
+                found.append(pdf.family)
+
+    assert bank.families == found
+
+
+@POPULATION
+def test_get_family_counts(size, row_limits, col_limits, weights):
+    """Test that the number of columns of each family in each individual is
+    counted correctly."""
+
+    population, families = _make_population(
+        size, row_limits, col_limits, weights
+    )
+    bank = MetadataBank.from_individuals(population, families)
+    counts = bank.get_family_counts()
+
+    assert counts.shape == (size, len(families))
+    for individual, row in zip(population, counts):
+        for family, count in zip(families, row):
+            assert count == sum(
+                pdf.family is family for pdf in individual.metadata
+            )
+
+        assert get_family_counts(individual.metadata, families) == dict(
+            zip(families, row)
+        )
+
+
+@POPULATION
+def test_get_family_codes(size, row_limits, col_limits, weights):
+    """Test that the family codes of the columns are split by individual."""
+
+    population, families = _make_population(
+        size, row_limits, col_limits, weights
+    )
+    bank = MetadataBank.from_individuals(population, families)
+    family_codes = bank.get_family_codes()
+
+    assert len(family_codes) == size
+    for individual, codes in zip(population, family_codes):
+        assert list(codes) == [
+            families.index(pdf.family) for pdf in individual.metadata
+        ]
+
+
+@POPULATION
+def test_get_subtype_ids(size, row_limits, col_limits, weights):
+    """Test that the subtypes in use are found for each family in the order
+    they first appear."""
+
+    population, families = _make_population(
+        size, row_limits, col_limits, weights
+    )
+    bank = MetadataBank.from_individuals(population, families)
+
+    expected = {}
+    for individual in population:
+        for pdf in individual.metadata:
+            subtype_ids = expected.setdefault(pdf.family, [])
+            if pdf.subtype_id not in subtype_ids:
+                subtype_ids.append(pdf.subtype_id)
+
+    assert bank.get_subtype_ids() == expected
+
+
+@POPULATION
+def test_get_param_values(size, row_limits, col_limits, weights):
+    """Test that the parameter values of each subtype are gathered into flat
+    arrays."""
+
+    population, families = _make_population(
+        size, row_limits, col_limits, weights
+    )
+    bank = MetadataBank.from_individuals(population, families)
+    param_values = bank.get_param_values()
+
+    pdfs = [pdf for individual in population for pdf in individual.metadata]
+    assert set(param_values) == {
+        (pdf.family, pdf.subtype_id) for pdf in pdfs
+    }
+
+    for (family, subtype_id), params in param_values.items():
+        subtype_pdfs = [
+            pdf
+            for pdf in pdfs
+            if pdf.family is family and pdf.subtype_id == subtype_id
+        ]
+        for name, values in params.items():
+            expected = np.hstack([vars(pdf)[name] for pdf in subtype_pdfs])
+            assert np.array_equal(values, expected)
@@ -4,13 +4,19 @@ import numpy as np
 import pandas as pd
 
 from edo import Family
-from edo.distributions import Gamma, Normal, Poisson
+from edo.distributions import Gamma, Normal, Poisson, Uniform
 from edo.individual import Individual, create_individual
+from edo.metadata import MetadataBank
 from edo.operators import mutation
+from edo.operators.mutation import _get_sparse_cells, mutate_values
+from edo.storage import ColumnStore
 
 from .util.parameters import (
+    INTEGER_INDIVIDUAL,
     INTEGER_MUTATION,
     INTEGER_TUPLE_MUTATION,
+    SPARSE_CELLS,
+    SPARSE_MUTATION,
     TUPLE_INTEGER_MUTATION,
     TUPLE_MUTATION,
 )
@@ -25,8 +31,9 @@ def _common_asserts(mutant, families):
     assert isinstance(dataframe, pd.DataFrame)
     assert isinstance(mutant.random_state, np.random.RandomState)
 
-    for pdf in metadata:
+    for dtype, pdf in zip(dataframe.dtypes, metadata):
         assert sum(pdf.family is family for family in families) == 1
+        assert dtype == pdf.dtype
 
 
 @INTEGER_MUTATION
@@ -146,3 +153,148 @@ def test_tuple_limits(row_limits, col_limits, weights, prob, seed):
 
     for i, count in enumerate(family_counts.values()):
         assert col_limits[0][i] <= count <= col_limits[1][i]
+
+
+@TUPLE_MUTATION
+def test_tuple_limits_family_counts(
+    row_limits, col_limits, weights, prob, seed
+):
+    """Verify that `mutation` gives the same individual whether or not it is
+    given the number of columns in each family, and that it does not change
+    the counts it is given."""
+
+    mutants = []
+    for given_counts in (False, True):
+        distributions = [Gamma, Normal, Poisson]
+        families = [Family(distribution) for distribution in distributions]
+        for family in families:
+            family.random_state = np.random.RandomState(seed)
+
+        state = np.random.RandomState(seed)
+        individual = create_individual(
+            row_limits, col_limits, families, weights, state
+        )
+
+        family_counts = None
+        if given_counts:
+            counts = MetadataBank([individual.metadata], families)
+            family_counts = dict(
+                zip(families, counts.get_family_counts()[0].tolist())
+            )
+            expected = dict(family_counts)
+
+        mutant = mutation(
+            individual,
+            prob,
+            row_limits,
+            col_limits,
+            families,
+            weights,
+            family_counts,
+        )
+        mutants.append(mutant)
+
+    assert family_counts == expected
+
+    mutant, other = mutants
+    assert np.array_equal(mutant.values, other.values)
+    assert [pdf.name for pdf in mutant.metadata] == [
+        pdf.name for pdf in other.metadata
+    ]
+
+
+@INTEGER_MUTATION
+def test_mutate_values(row_limits, col_limits, weights, prob, seed):
+    """Verify that `mutate_values` keeps the shape and datatypes of a dataset
+    and is reproducible under a fixed seed."""
+
+    distributions = [Gamma, Normal, Poisson]
+    families = [Family(distribution) for distribution in distributions]
+    state = np.random.RandomState(seed)
+
+    individual = create_individual(
+        row_limits, col_limits, families, weights, state
+    )
+    dataframe, metadata = individual
+
+    mutants = [
+        mutate_values(
+            ColumnStore.from_dataframe(dataframe),
+            metadata,
+            np.random.RandomState(seed),
+            prob,
+        ).to_dataframe()
+        for _ in [0, 1]
+    ]
+
+    assert mutants[0].equals(mutants[1])
+    assert mutants[0].shape == dataframe.shape
+    assert list(mutants[0].dtypes) == list(dataframe.dtypes)
+
+
+@INTEGER_INDIVIDUAL
+def test_mutate_values_extremes(row_limits, col_limits, weights, seed):
+    """Verify that no values are mutated when the probability is zero and that
+    every value is resampled when the probability is one."""
+
+    distributions = [Normal, Uniform, Normal]
+    families = [Family(distribution) for distribution in distributions]
+    state = np.random.RandomState(seed)
+
+    individual = create_individual(
+        row_limits, col_limits, families, weights, state
+    )
+    dataframe, metadata = individual
+
+    store = ColumnStore.from_dataframe(dataframe)
+    unchanged = mutate_values(store, metadata, state, 0).to_dataframe()
+    assert unchanged.equals(dataframe)
+
+    store = ColumnStore.from_dataframe(dataframe)
+    mutant = mutate_values(store, metadata, state, 1).to_dataframe()
+    assert (mutant.values != dataframe.values).all()
+
+
+@SPARSE_MUTATION
+def test_mutate_values_sparse(row_limits, col_limits, weights, prob, seed):
+    """Verify that mutating with a very small probability keeps the shape and
+    datatypes of a dataset and is reproducible under a fixed seed."""
+
+    distributions = [Gamma, Normal, Poisson]
+    families = [Family(distribution) for distribution in distributions]
+    state = np.random.RandomState(seed)
+
+    individual = create_individual(
+        row_limits, col_limits, families, weights, state
+    )
+    dataframe, metadata = individual
+
+    mutants = [
+        mutate_values(
+            ColumnStore.from_dataframe(dataframe),
+            metadata,
+            np.random.RandomState(seed),
+            prob,
+        ).to_dataframe()
+        for _ in [0, 1]
+    ]
+
+    assert mutants[0].equals(mutants[1])
+    assert mutants[0].shape == dataframe.shape
+    assert list(mutants[0].dtypes) == list(dataframe.dtypes)
+
+
+@SPARSE_CELLS
+def test_get_sparse_cells(ncells, prob, seed):
+    """Verify that the cells chosen for a sparse mutation are distinct, sorted
+    and lie within the dataset."""
+
+    state = np.random.RandomState(seed)
+    cells = _get_sparse_cells(ncells, prob, state)
+
+    assert cells.dtype.kind == "i"
+    assert np.all(np.diff(cells) > 0)
+    assert np.all((0 <= cells) & (cells < ncells))
+
+    if prob == 0:
+        assert len(cells) == 0
@@ -21,6 +21,8 @@ from hypothesis.strategies import (
 import edo
 from edo import DataOptimiser
 from edo.distributions import all_distributions
+from edo.dtypes import compact
+from edo.formats import FORMATS
 from edo.individual import Individual
 from edo.optimiser import _get_fit_history, _get_pop_history
 
@@ -439,6 +441,90 @@ def test_update_subtypes(
     assert parent_subtypes == updated_subtypes
 
 
+@OPTIMISER
+def test_merge_and_evict_subtypes(
+    size,
+    row_limits,
+    col_limits,
+    distributions,
+    weights,
+    max_iter,
+    best_prop,
+    lucky_prop,
+    crossover_prob,
+    mutation_prob,
+    shrinkage,
+    maximise,
+):
+    """Test that the DataOptimiser can merge identical subtypes into one and
+    evict those that are unused from the registry of each family."""
+
+    families = [edo.Family(dist, registry_size=0) for dist in distributions]
+
+    do = DataOptimiser(
+        trivial_fitness,
+        size,
+        row_limits,
+        col_limits,
+        families,
+        weights,
+        max_iter,
+        best_prop,
+        lucky_prop,
+        crossover_prob,
+        mutation_prob,
+        shrinkage,
+        maximise,
+    )
+
+    do.random_state = np.random.RandomState(size)
+    do._initialise_run(4)
+
+    do._merge_subtypes()
+    for family in families:
+        assert family.merge_subtypes() == {}
+
+    for family in families:
+        for subtype_id in family.subtypes:
+            family.update_subtype(subtype_id, family.distribution.param_limits)
+
+    pdfs = [pdf for individual in do.population for pdf in individual.metadata]
+    originals = [(pdf.subtype_id, pdf.param_limits) for pdf in pdfs]
+    do._merge_subtypes()
+    for family in families:
+        assert len(family.subtypes) <= 1
+
+    population_subtypes = do._get_current_subtypes(do.population)
+    for family, subtype_ids in population_subtypes.items():
+        assert subtype_ids == list(family.subtypes)
+
+    moved = [
+        pdf
+        for individual in do.population
+        for pdf in individual.metadata
+        if not any(pdf is old for old in pdfs)
+    ]
+    for pdf in moved:
+        subtype = pdf.family.subtypes[pdf.subtype_id]
+        assert pdf.param_limits is subtype.param_limits
+
+    for pdf, (subtype_id, param_limits) in zip(pdfs, originals):
+        assert pdf.subtype_id == subtype_id
+        assert pdf.param_limits is param_limits
+
+    family = families[0]
+    family.add_subtype()
+    family.subtypes.pop(family.subtype_id - 1)
+    do._evict_subtypes()
+
+    for family in families:
+        assert family.all_subtypes == family.subtypes
+        family.registry_size = None
+
+    do.population = None
+    do._evict_subtypes()
+
+
 @OPTIMISER
 @settings(deadline=None, max_examples=30)
 def test_write_generation(
@@ -817,6 +903,79 @@ def test_run_on_disk_serial(
                 )
 
 
+@OPTIMISER
+@settings(deadline=None, max_examples=5)
+def test_run_on_disk_formats(
+    size,
+    row_limits,
+    col_limits,
+    distributions,
+    weights,
+    max_iter,
+    best_prop,
+    lucky_prop,
+    crossover_prob,
+    mutation_prob,
+    shrinkage,
+    maximise,
+):
+    """Test that the EA can write its histories to disk in each format, or as
+    one archive for each generation, and that everything but CSV recovers
+    the datasets exactly."""
+
+    histories = {}
+    for format in [None, *FORMATS, "archive"]:
+        families = [edo.Family(dist) for dist in distributions]
+        do = DataOptimiser(
+            trivial_fitness,
+            size,
+            row_limits,
+            col_limits,
+            families,
+            weights,
+            max_iter,
+            best_prop,
+            lucky_prop,
+            crossover_prob,
+            mutation_prob,
+            shrinkage,
+            maximise,
+        )
+
+        if format is None:
+            histories[format], _ = do.run(random_state=size)
+            continue
+
+        root = f".testcache_{format}"
+        histories[format], _ = do.run(
+            root=root, random_state=size, format=format
+        )
+        if format == "archive":
+            assert sorted(os.listdir(f"{root}/0")) == [
+                "population.data",
+                "population.meta",
+            ]
+        else:
+            assert Path(f"{root}/0/0/{FORMATS[format].filename}").exists()
+
+        for gen_on_disk, gen_in_memory in zip(
+            histories[format], histories[None]
+        ):
+            for on_disk, in_memory in zip(gen_on_disk, gen_in_memory):
+                dataframe = on_disk.dataframe.compute()
+                assert list(dataframe.columns) == list(
+                    in_memory.dataframe.columns
+                )
+                if format == "csv":
+                    assert np.allclose(
+                        dataframe.values, in_memory.dataframe.values
+                    )
+                else:
+                    assert dataframe.equals(in_memory.dataframe)
+
+        os.system(f"rm -r {root}")
+
+
 @OPTIMISER
 @settings(deadline=None, max_examples=10)
 def test_run_on_disk_parallel(
@@ -960,6 +1119,234 @@ def test_run_is_reproducible(
             assert ind_from_one.dataframe.equals(ind_from_two.dataframe)
 
 
+@OPTIMISER
+@settings(deadline=None, max_examples=10)
+def test_run_with_generator(
+    size,
+    row_limits,
+    col_limits,
+    distributions,
+    weights,
+    max_iter,
+    best_prop,
+    lucky_prop,
+    crossover_prob,
+    mutation_prob,
+    shrinkage,
+    maximise,
+):
+    """Test that the EA uses ``np.random.Generator`` instances throughout when
+    given a seed, a seed sequence or a generator, and that these give the same
+    results. Test that a ``np.random.RandomState`` is still supported."""
+
+    histories = []
+    for random_state in (
+        size,
+        np.random.SeedSequence(size),
+        np.random.default_rng(size),
+        np.random.RandomState(size),
+    ):
+        families = [edo.Family(dist) for dist in distributions]
+        do = DataOptimiser(
+            trivial_fitness,
+            size,
+            row_limits,
+            col_limits,
+            families,
+            weights,
+            max_iter,
+            best_prop,
+            lucky_prop,
+            crossover_prob,
+            mutation_prob,
+            shrinkage,
+            maximise,
+        )
+
+        _, fit_history = do.run(random_state=random_state)
+        histories.append(fit_history)
+
+        kind = type(do.random_state)
+        assert all(isinstance(state, kind) for state in do.states.values())
+        assert all(isinstance(fam.random_state, kind) for fam in families)
+
+    assert isinstance(do.random_state, np.random.RandomState)
+    assert histories[0].equals(histories[1])
+    assert histories[0].equals(histories[2])
+
+
+@OPTIMISER
+@settings(deadline=None, max_examples=5)
+def test_run_compact(
+    size,
+    row_limits,
+    col_limits,
+    distributions,
+    weights,
+    max_iter,
+    best_prop,
+    lucky_prop,
+    crossover_prob,
+    mutation_prob,
+    shrinkage,
+    maximise,
+):
+    """Test that every column made during a run with the compact datatype
+    policy has the compact datatype of its distribution, and that boolean
+    columns are packed."""
+
+    families = [edo.Family(dist) for dist in distributions]
+    do = DataOptimiser(
+        trivial_fitness,
+        size,
+        row_limits,
+        col_limits,
+        families,
+        weights,
+        max_iter,
+        best_prop,
+        lucky_prop,
+        crossover_prob,
+        mutation_prob,
+        shrinkage,
+        maximise,
+        dtype_policy="compact",
+    )
+
+    pop_history, _ = do.run(random_state=size)
+
+    assert all(family.dtype_policy == "compact" for family in families)
+    for population in pop_history:
+        for individual in population:
+            dataframe, metadata = individual
+            for j, (dtype, pdf) in enumerate(zip(dataframe.dtypes, metadata)):
+                assert dtype == pdf.dtype
+                assert individual.store.is_packed(j) is (dtype == bool)
+
+                preferred = np.dtype(type(pdf).dtype)
+                assert dtype.itemsize < preferred.itemsize
+
+
+@OPTIMISER
+@settings(deadline=None, max_examples=5)
+def test_family_dtype_policy(
+    size,
+    row_limits,
+    col_limits,
+    distributions,
+    weights,
+    max_iter,
+    best_prop,
+    lucky_prop,
+    crossover_prob,
+    mutation_prob,
+    shrinkage,
+    maximise,
+):
+    """Test that the families keep their own datatype policies unless the
+    optimiser is given one."""
+
+    families = [
+        edo.Family(dist, dtype_policy="compact") for dist in distributions
+    ]
+    do = DataOptimiser(
+        trivial_fitness,
+        size,
+        row_limits,
+        col_limits,
+        families,
+        weights,
+        max_iter,
+        best_prop,
+        lucky_prop,
+        crossover_prob,
+        mutation_prob,
+        shrinkage,
+        maximise,
+    )
+
+    assert do.dtype_policy is None
+
+    do.random_state = np.random.RandomState(size)
+    do._initialise_run(4)
+
+    assert all(family.dtype_policy == "compact" for family in families)
+    for individual in do.population:
+        dataframe, metadata = individual
+        for dtype, pdf in zip(dataframe.dtypes, metadata):
+            assert dtype == compact(type(pdf), pdf.param_limits)
+
+    do.dtype_policy = "default"
+    do._initialise_run(4)
+
+    assert all(family.dtype_policy == "default" for family in families)
+
+
+@OPTIMISER
+@settings(deadline=None, max_examples=5)
+def test_run_with_counter_streams(
+    size,
+    row_limits,
+    col_limits,
+    distributions,
+    weights,
+    max_iter,
+    best_prop,
+    lucky_prop,
+    crossover_prob,
+    mutation_prob,
+    shrinkage,
+    maximise,
+):
+    """Test that the EA derives the PRNG of each offspring from the seed, the
+    generation and its position when using counter-based streams, and that
+    runs with the same seed give the same results whatever the number of
+    processes."""
+
+    histories = []
+    for random_state, processes in (
+        (size, None),
+        (np.random.SeedSequence(size), 4),
+    ):
+        families = [edo.Family(dist) for dist in distributions]
+        do = DataOptimiser(
+            trivial_fitness,
+            size,
+            row_limits,
+            col_limits,
+            families,
+            weights,
+            max_iter,
+            best_prop,
+            lucky_prop,
+            crossover_prob,
+            mutation_prob,
+            shrinkage,
+            maximise,
+        )
+
+        pop_history, fit_history = do.run(
+            random_state=random_state,
+            processes=processes,
+            counter_streams=True,
+        )
+        histories.append((pop_history, fit_history))
+
+        assert do.entropy == size
+        for slot, state in do.states.items():
+            seed_seq = state.bit_generator.seed_seq
+            assert seed_seq.entropy == size
+            assert seed_seq.spawn_key == (do.generation, slot)
+
+    (pop_history_one, fit_history_one), (pop_history_two, fit_history_two) = (
+        histories
+    )
+    assert fit_history_one.equals(fit_history_two)
+    for gen_from_one, gen_from_two in zip(pop_history_one, pop_history_two):
+        for ind_from_one, ind_from_two in zip(gen_from_one, gen_from_two):
+            assert ind_from_one.dataframe.equals(ind_from_two.dataframe)
+
+
 @given(
     size=integers(min_value=10, max_value=50),
     distributions=lists(
@@ -72,7 +72,7 @@ def test_create_new_population(
     parents = population[:parent_size]
 
     population = create_new_population(
-        parents,
+        np.arange(parent_size),
         population,
         crossover_prob,
         mutation_prob,
@@ -107,3 +107,40 @@ def test_create_new_population(
 
         for i, limits in enumerate([row_limits, col_limits]):
             assert limits[0] <= dataframe.shape[i] <= limits[1]
+
+
+@POPULATION
+@settings(max_examples=25, deadline=None)
+def test_create_new_population_repeated_parents(
+    size, row_limits, col_limits, weights
+):
+    """Verify that a parent selected more than once is carried over once and
+    the new population is still of the correct size."""
+
+    distributions = [Gamma, Normal, Poisson]
+    families = [Family(distribution) for distribution in distributions]
+    states = {i: np.random.RandomState(i) for i in range(size)}
+
+    population = create_initial_population(
+        row_limits, col_limits, families, weights, states
+    )
+    parent_idxs = np.array([1, 0, 1, 1])
+
+    new_population = create_new_population(
+        parent_idxs,
+        population,
+        0.5,
+        0.01,
+        row_limits,
+        col_limits,
+        families,
+        weights,
+        states,
+    )
+
+    assert len(new_population) == size
+    assert new_population[0] is population[1]
+    assert new_population[1] is population[0]
+    assert all(
+        individual not in population[:2] for individual in new_population[2:]
+    )
@@ -0,0 +1,159 @@
+""" Tests for the handling of both kinds of PRNG. """
+
+import numpy as np
+from hypothesis import given
+from hypothesis.strategies import integers, sampled_from
+
+from edo.prng import get_entropy, get_random_state, get_stream, get_streams
+from edo.prng import integers as sample_integers
+from edo.prng import spawn
+
+KINDS = sampled_from([np.random.default_rng, np.random.RandomState])
+
+
+@given(seed=integers(min_value=0, max_value=100))
+def test_get_random_state(seed):
+    """Test that seeds and seed sequences create generators, that existing
+    PRNGs are used as they are and that the global PRNG is the default."""
+
+    generator = get_random_state(seed)
+    assert isinstance(generator, np.random.Generator)
+    assert generator.random() == np.random.default_rng(seed).random()
+
+    sequence = get_random_state(np.random.SeedSequence(seed))
+    assert isinstance(sequence, np.random.Generator)
+    assert sequence.random() == np.random.default_rng(seed).random()
+
+    state = np.random.RandomState(seed)
+    assert get_random_state(state) is state
+    assert get_random_state(generator) is generator
+    assert get_random_state() is np.random.mtrand._rand
+
+
+@given(
+    kind=KINDS,
+    seed=integers(min_value=0, max_value=100),
+    high=integers(min_value=1, max_value=100),
+)
+def test_integers(kind, seed, high):
+    """ Test that integers are sampled from a half-open interval. """
+
+    random_state = kind(seed)
+
+    values = sample_integers(random_state, high, size=10)
+    assert ((values >= 0) & (values < high)).all()
+
+    values = sample_integers(random_state, high, high + 5, size=10)
+    assert ((values >= high) & (values < high + 5)).all()
+
+
+@given(
+    kind=KINDS,
+    seed=integers(min_value=0, max_value=100),
+    n=integers(min_value=0, max_value=10),
+)
+def test_spawn(kind, seed, n):
+    """Test that new PRNGs of the same kind are created reproducibly, that
+    their streams are distinct and that spawning again gives new streams."""
+
+    random_state = kind(seed)
+    children = spawn(random_state, n)
+
+    draws = []
+    assert len(children) == n
+    for child, other in zip(children, spawn(kind(seed), n)):
+        assert type(child) is type(random_state)
+
+        draw = child.random()
+        assert draw == other.random()
+        draws.append(draw)
+
+    assert len(set(draws)) == n
+
+    others = spawn(random_state, n)
+    for draw, other in zip(draws, others):
+        assert draw != other.random()
+
+
+@given(
+    key=integers(min_value=0, max_value=100),
+    n=integers(min_value=1, max_value=10),
+)
+def test_spawn_without_seed_sequence(key, n):
+    """Test that a generator without a seed sequence spawns new generators
+    from entropy that it samples."""
+
+    random_state = np.random.Generator(np.random.Philox(key=key))
+    children = spawn(random_state, n)
+
+    other = np.random.Generator(np.random.Philox(key=key))
+    for child, other_child in zip(children, spawn(other, n)):
+        assert isinstance(child, np.random.Generator)
+        assert child.random() == other_child.random()
+
+
+@given(
+    seed=integers(min_value=0, max_value=100),
+    n=integers(min_value=1, max_value=10),
+)
+def test_spawn_private_seed_sequence(seed, n):
+    """Test that the seed sequence is found from its private attribute where
+    the bit generator has no public one, as in older versions of numpy."""
+
+    class BitGenerator:
+        """ A bit generator without a public seed sequence. """
+
+        _seed_seq = np.random.SeedSequence(seed)
+
+    class Generator(np.random.Generator):
+        """ A generator whose bit generator is the one above. """
+
+        bit_generator = BitGenerator()
+
+    random_state = Generator(np.random.PCG64())
+    for child, other in zip(
+        spawn(random_state, n), np.random.SeedSequence(seed).spawn(n)
+    ):
+        assert child.random() == np.random.default_rng(other).random()
+
+
+@given(
+    kind=KINDS,
+    seed=integers(min_value=0, max_value=100),
+)
+def test_get_entropy(kind, seed):
+    """Test that the entropy of a run is taken from a seed or seed sequence and
+    is otherwise sampled reproducibly from the PRNG."""
+
+    assert get_entropy(seed) == seed
+    assert get_entropy(np.random.SeedSequence(seed)) == seed
+
+    entropy = get_entropy(kind(seed))
+    assert isinstance(entropy, int)
+    assert entropy == get_entropy(kind(seed))
+
+
+@given(
+    entropy=integers(min_value=0, max_value=100),
+    generation=integers(min_value=0, max_value=10),
+    size=integers(min_value=1, max_value=10),
+)
+def test_get_stream(entropy, generation, size):
+    """Test that the stream of each slot in a generation depends only on the
+    entropy, generation and slot, and that the streams are distinct."""
+
+    streams = get_streams(entropy, generation, size)
+    assert list(streams) == list(range(size))
+
+    draws = []
+    for slot in reversed(range(size)):
+        stream = streams[slot]
+        assert isinstance(stream, np.random.Generator)
+        assert isinstance(stream.bit_generator, np.random.Philox)
+
+        draw = stream.random()
+        assert draw == get_stream(entropy, generation, slot).random()
+        assert draw != get_stream(entropy, generation + 1, slot).random()
+        draws.append(draw)
+
+    assert len(set(draws)) == size
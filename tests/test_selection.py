@@ -2,12 +2,27 @@
 
 import numpy as np
 import pandas as pd
+import pytest
+from hypothesis import given
+from hypothesis.strategies import (
+    booleans,
+    floats,
+    integers,
+    lists,
+    sampled_from,
+)
 
 from edo import Family
 from edo.distributions import Gamma, Normal, Poisson
 from edo.fitness import get_population_fitness
 from edo.individual import Individual
 from edo.operators import selection
+from edo.operators.selection import (
+    SELECTION_METHODS,
+    rank,
+    stochastic_universal,
+    tournament,
+)
 from edo.population import create_initial_population
 
 from .util.parameters import SELECTION
@@ -32,10 +47,14 @@ def test_selection_by_parents(
     )
 
     pop_fitness = get_population_fitness(population, trivial_fitness)
-    parents = selection(
+    parent_idxs = selection(
         population, pop_fitness, best_prop, lucky_prop, state, maximise
     )
+    parents = [population[i] for i in parent_idxs]
 
+    assert isinstance(parent_idxs, np.ndarray)
+    assert parent_idxs.dtype.kind == "i"
+    assert len(set(parent_idxs)) == len(parent_idxs)
     assert len(parents) == min(
         size, int(best_prop * size) + int(lucky_prop * size)
     )
@@ -53,3 +72,104 @@ def test_selection_by_parents(
 
         for i, limits in enumerate([row_limits, col_limits]):
             assert limits[0] <= dataframe.shape[i] <= limits[1]
+
+
+@given(
+    pop_fitness=lists(floats(-100, 100), min_size=1, max_size=50),
+    best_prop=floats(0, 1),
+    lucky_prop=floats(0, 1),
+    seed=integers(0, 100),
+    maximise=booleans(),
+)
+def test_selection_by_fitness(
+    pop_fitness, best_prop, lucky_prop, seed, maximise
+):
+    """Verify that the best individuals are selected first, in order, and that
+    the lucky individuals are drawn from the rest of the population."""
+
+    size = len(pop_fitness)
+    population = list(range(size))
+    state = np.random.RandomState(seed)
+
+    parent_idxs = selection(
+        population, pop_fitness, best_prop, lucky_prop, state, maximise
+    )
+
+    num_best = int(best_prop * size)
+    fitness = -np.array(pop_fitness) if maximise else np.array(pop_fitness)
+    best, lucky = parent_idxs[:num_best], parent_idxs[num_best:]
+
+    assert np.array_equal(fitness[best], np.sort(fitness)[:num_best])
+    assert len(lucky) == min(int(lucky_prop * size), size - num_best)
+    assert not set(best).intersection(lucky)
+
+
+@given(
+    pop_fitness=lists(floats(-100, 100), min_size=1, max_size=50),
+    best_prop=floats(0, 1),
+    lucky_prop=floats(0, 1),
+    seed=integers(0, 100),
+    maximise=booleans(),
+    method=sampled_from(list(SELECTION_METHODS)),
+)
+def test_selection_strategies(
+    pop_fitness, best_prop, lucky_prop, seed, maximise, method
+):
+    """Verify that each of the built-in selection strategies selects the right
+    number of valid parent indices."""
+
+    size = len(pop_fitness)
+    population = list(range(size))
+    state = np.random.RandomState(seed)
+
+    parent_idxs = selection(
+        population, pop_fitness, best_prop, lucky_prop, state, maximise, method
+    )
+
+    assert isinstance(parent_idxs, np.ndarray)
+    assert parent_idxs.dtype.kind == "i"
+    assert len(parent_idxs) == min(
+        size, int(best_prop * size) + int(lucky_prop * size)
+    )
+    assert np.all((0 <= parent_idxs) & (parent_idxs < size))
+
+
+@given(size=integers(2, 50), seed=integers(0, 100))
+def test_selection_pressure(size, seed):
+    """Verify that tournament, stochastic universal and rank selection favour
+    fitter individuals, and that a custom strategy can be used."""
+
+    pop_fitness = np.arange(size, dtype=float)
+    state = np.random.RandomState(seed)
+
+    winners = tournament(pop_fitness, 1000, state, size=2)
+    assert np.mean(winners) < np.mean(pop_fitness)
+
+    parent_idxs = stochastic_universal(pop_fitness, size, state)
+    assert size - 1 not in parent_idxs
+    assert 0 in parent_idxs
+
+    flat = stochastic_universal(np.zeros(size), size, state)
+    assert np.array_equal(flat, np.arange(size))
+
+    parent_idxs = rank(pop_fitness, 1000, state, pressure=2)
+    assert size - 1 not in parent_idxs
+
+    parent_idxs = selection(
+        list(pop_fitness),
+        pop_fitness,
+        1,
+        0,
+        state,
+        method=lambda fitness, num, state: np.argsort(fitness)[:num],
+    )
+    assert np.array_equal(parent_idxs, np.arange(size))
+
+
+def test_unknown_selection_method():
+    """Verify that an unknown selection method raises an error that names the
+    known methods."""
+
+    state = np.random.RandomState(0)
+    with pytest.raises(ValueError, match="'truncation', 'rank'"):
+        selection([0, 1], [0, 1], 0.5, 0.5, state, method="roulette")
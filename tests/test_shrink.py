@@ -1,11 +1,14 @@
 """ Tests for the shrinking of the search space. """
 
 import numpy as np
+from hypothesis import given
+from hypothesis.strategies import floats, integers
 
 from edo import Family
 from edo.distributions import Gamma, Normal, Poisson
 from edo.fitness import get_population_fitness
 from edo.operators import selection, shrink
+from edo.operators.shrink import _get_param_index, _get_subtype_param_limits
 from edo.population import create_initial_population
 
 from .util.parameters import SHRINK
@@ -31,10 +34,12 @@ def test_shrink(
     )
 
     pop_fitness = get_population_fitness(population, trivial_fitness)
-    parents = selection(
+    parent_idxs = selection(
         population, pop_fitness, best_prop, lucky_prop, state, maximise
     )
+    parents = [population[i] for i in parent_idxs]
 
+    index = _get_param_index(parents)
     families = shrink(parents, families, itr, compact_ratio)
 
     for family in families:
@@ -43,3 +48,102 @@ def test_shrink(
             pdf = subtype(state)
 
             assert subtype.param_limits == pdf.param_limits
+
+            for name, (lower, upper) in subtype.param_limits.items():
+                hard_lower, hard_upper = subtype.hard_limits[name]
+                assert hard_lower <= lower <= upper <= hard_upper
+
+                if (family, subtype.subtype_id) in index:
+                    params = index[(family, subtype.subtype_id)]
+                    width = (hard_upper - hard_lower) * compact_ratio ** itr
+                    midpoint = params[name].mean()
+                    assert upper - lower <= width + 1e-8
+                    assert lower - 1e-8 <= midpoint <= upper + 1e-8
+
+
+@SHRINK
+def test_get_param_index(
+    size, row_limits, col_limits, weights, props, maximise, compact_ratio, itr
+):
+    """Test that the parameter index gathers every parameter value of every
+    subtype in the parents."""
+
+    distributions = [Gamma, Normal, Poisson]
+    families = [Family(dist) for dist in distributions]
+    states = {i: np.random.RandomState(i) for i in range(size)}
+
+    parents = create_initial_population(
+        row_limits, col_limits, families, weights, states
+    )
+
+    index = _get_param_index(parents)
+
+    for (family, subtype_id), params in index.items():
+        pdfs = [
+            pdf
+            for _, metadata in parents
+            for pdf in metadata
+            if pdf.family is family and pdf.subtype_id == subtype_id
+        ]
+
+        assert set(params) == set(family.subtypes[subtype_id].param_limits)
+        for name, values in params.items():
+            assert np.array_equal(values, [vars(pdf)[name] for pdf in pdfs])
+
+
+class ShiftedNormal(Normal):
+    """ A normal distribution with a non-numeric attribute. """
+
+    name = "ShiftedNormal"
+
+    def __init__(self, random_state):
+
+        super().__init__(random_state)
+        self.kind = "shifted"
+
+
+@SHRINK
+def test_shrink_non_numeric_attribute(
+    size, row_limits, col_limits, weights, props, maximise, compact_ratio, itr
+):
+    """Test that attributes of a distribution without any limits are left
+    out of the parameter index, so that they need not be numeric."""
+
+    families = [Family(ShiftedNormal)]
+    states = {i: np.random.RandomState(i) for i in range(size)}
+
+    parents = create_initial_population(
+        row_limits, col_limits, families, None, states
+    )
+
+    index = _get_param_index(parents)
+    for params in index.values():
+        assert set(params) == {"mean", "std"}
+
+    families = shrink(parents, families, itr, compact_ratio)
+    for subtype in families[0].subtypes.values():
+        for name, (lower, upper) in subtype.param_limits.items():
+            hard_lower, hard_upper = subtype.hard_limits[name]
+            assert hard_lower <= lower <= upper <= hard_upper
+
+
+@given(
+    midpoint=floats(min_value=2, max_value=10),
+    shrinkage=floats(min_value=0, max_value=1),
+    itr=integers(min_value=1, max_value=5),
+)
+def test_shrink_midpoint_outside_limits(midpoint, shrinkage, itr):
+    """Test that the limits of a subtype do not widen when the mean of its
+    parameter values falls outside of its current limits."""
+
+    family = Family(Normal)
+    family.add_subtype({"mean": [0, 1], "std": [0, 1]})
+    subtype = family.subtypes[0]
+
+    param_values = {"mean": np.array([midpoint]), "std": np.array([0.5])}
+    param_limits = _get_subtype_param_limits(
+        subtype, param_values, itr, shrinkage
+    )
+
+    for lower, upper in param_limits.values():
+        assert 0 <= lower <= upper <= 1
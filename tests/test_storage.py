@@ -0,0 +1,231 @@
+""" Tests for the columnar storage of datasets. """
+
+import numpy as np
+import pandas as pd
+from hypothesis import given
+from hypothesis.strategies import integers
+
+from edo.storage import ColumnStore
+
+SHAPE = given(
+    nrows=integers(min_value=1, max_value=50),
+    ncols=integers(min_value=0, max_value=5),
+    seed=integers(min_value=0, max_value=100),
+)
+
+
+def _make_dataframe(nrows, ncols, seed):
+    """ Make a dataframe with alternating float and integer columns. """
+
+    state = np.random.RandomState(seed)
+    return pd.DataFrame(
+        {
+            j: state.random(nrows) if j % 2 else state.randint(10, size=nrows)
+            for j in range(ncols)
+        },
+        index=pd.RangeIndex(nrows),
+    )
+
+
+@SHAPE
+def test_from_dataframe(nrows, ncols, seed):
+    """Test that a store can be made from a dataframe and turned back into an
+    identical one with spare capacity in its buffers."""
+
+    dataframe = _make_dataframe(nrows, ncols, seed)
+    store = ColumnStore.from_dataframe(dataframe)
+
+    assert store.shape == (nrows, ncols)
+    assert repr(store) == f"ColumnStore(nrows={nrows}, ncols={ncols})"
+    for buffer in store._buffers:
+        assert len(buffer) > nrows
+
+    assert store.to_dataframe().equals(dataframe)
+
+
+@SHAPE
+def test_append_row(nrows, ncols, seed):
+    """Test that rows can be appended beyond the original capacity of a store
+    without losing any values or changing their datatypes."""
+
+    dataframe = _make_dataframe(nrows, ncols, seed)
+    store = ColumnStore.from_dataframe(dataframe)
+
+    rows = dataframe.values[::-1]
+    for row in rows:
+        store.append_row(row)
+
+    expected = pd.concat([dataframe, dataframe.iloc[::-1]], ignore_index=True)
+    assert store.nrows == 2 * nrows
+    assert store.to_dataframe().equals(expected)
+
+
+@SHAPE
+def test_remove_row(nrows, ncols, seed):
+    """Test that removing a row swaps the last row into its place."""
+
+    dataframe = _make_dataframe(nrows, ncols, seed)
+    store = ColumnStore.from_dataframe(dataframe)
+    row = np.random.RandomState(seed).randint(nrows)
+
+    store.remove_row(row)
+    expected = dataframe.copy()
+    expected.iloc[row] = dataframe.iloc[-1]
+    expected = expected.iloc[:-1]
+
+    assert store.nrows == nrows - 1
+    assert store.to_dataframe().equals(expected)
+
+
+@SHAPE
+def test_columns(nrows, ncols, seed):
+    """Test that columns can be added, updated and removed, and the remaining
+    columns are relabelled by their position."""
+
+    dataframe = _make_dataframe(nrows, ncols, seed)
+    store = ColumnStore.from_dataframe(dataframe)
+
+    store.append_column(np.arange(nrows))
+    assert store.ncols == ncols + 1
+    assert np.array_equal(store.column(ncols), np.arange(nrows))
+
+    store.update(ncols, [0], [-1])
+    assert store.column(ncols)[0] == -1
+
+    store.remove_column(0)
+    output = store.to_dataframe()
+    assert list(output.columns) == list(range(ncols))
+    assert output.shape == (nrows, ncols)
+    if ncols:
+        assert np.array_equal(output[ncols - 1], store.column(ncols - 1))
+
+
+@SHAPE
+def test_empty_blocks(nrows, ncols, seed):
+    """Test that an empty store gathers its columns into one block for each
+    datatype and can be filled column by column."""
+
+    dataframe = _make_dataframe(nrows, ncols, seed)
+    store = ColumnStore.empty(list(dataframe.dtypes), nrows)
+    for j, col in enumerate(dataframe.columns):
+        store.set_column(j, dataframe[col].to_numpy())
+
+    assert store.shape == (nrows, ncols)
+    assert store.to_dataframe().equals(dataframe)
+
+    blocks = {id(buffer.base) for buffer in store._buffers}
+    assert len(blocks) == len(set(dataframe.dtypes))
+    for buffer in store._buffers:
+        assert buffer.flags.c_contiguous
+        assert len(buffer) > nrows
+
+
+@SHAPE
+def test_copy_on_write(nrows, ncols, seed):
+    """Test that a linked column shares its buffer with the original store
+    until either store writes to it, at which point the writer copies it."""
+
+    dataframe = _make_dataframe(nrows, ncols + 1, seed)
+    parent = ColumnStore.from_dataframe(dataframe)
+    child = ColumnStore.empty([None] * (ncols + 1), nrows)
+    for j in range(ncols + 1):
+        child.link(j, parent, j)
+
+    for j in range(ncols + 1):
+        assert np.shares_memory(child.column(j), parent.column(j))
+        assert not child.column(j).flags.writeable
+        assert not parent.column(j).flags.writeable
+
+    child.update(0, [0], [-1])
+    assert child.column(0)[0] == -1
+    assert parent.column(0)[0] == dataframe[0][0]
+    assert not np.shares_memory(child.column(0), parent.column(0))
+
+    parent.remove_row(0)
+    assert parent.column(0).flags.writeable
+    assert child.to_dataframe().iloc[1:, 1:].equals(dataframe.iloc[1:, 1:])
+
+    child.append_row(dataframe.iloc[0])
+    assert child.nrows == nrows + 1
+    for j in range(ncols + 1):
+        assert not np.shares_memory(child.column(j), parent.column(j))
+        assert child.column(j).flags.writeable
+
+
+@SHAPE
+def test_packed_columns(nrows, ncols, seed):
+    """Test that boolean columns are packed into bits and that they can be
+    read, written, counted and resized like any other column."""
+
+    state = np.random.RandomState(seed)
+    dataframe = pd.DataFrame(
+        {j: state.random(nrows) < 0.5 for j in range(ncols + 1)},
+        index=pd.RangeIndex(nrows),
+    )
+    expected = dataframe.to_numpy().copy()
+    store = ColumnStore.from_dataframe(dataframe)
+
+    assert store.to_dataframe().equals(dataframe)
+    for j in range(ncols + 1):
+        assert store.is_packed(j)
+        assert store.dtype(j) == bool
+        assert store._buffers[j].dtype == np.uint8
+        assert len(store._buffers[j]) * 8 > nrows
+
+        rows = state.choice(nrows, size=nrows // 2 + 1)
+        assert np.array_equal(store.take(j, rows), expected[rows, j])
+
+    mask = state.random(nrows) < 0.5
+    store.update(0, mask, True)
+    expected[mask, 0] = True
+    rows = state.choice(nrows, size=min(nrows, 3), replace=False)
+    values = state.random(len(rows)) < 0.5
+    store.update(0, rows, values)
+    expected[rows, 0] = values
+    assert np.array_equal(store.column(0), expected[:, 0])
+
+    row = state.random(ncols + 1) < 0.5
+    for _ in range(10):
+        store.append_row(row)
+        expected = np.vstack([expected, row])
+    assert np.array_equal(store.to_dataframe().to_numpy(), expected)
+
+    store.remove_row(0)
+    expected[0] = expected[-1]
+    expected = expected[:-1]
+    assert np.array_equal(store.to_dataframe().to_numpy(), expected)
+
+    column = state.random(len(expected)) < 0.5
+    store.append_column(column)
+    assert store.is_packed(ncols + 1)
+    assert np.array_equal(store.column(ncols + 1), column)
+
+
+@SHAPE
+def test_empty_packed(nrows, ncols, seed):
+    """Test that an empty store packs its boolean columns into buffers of
+    their own and that a linked packed column is copied when written to."""
+
+    state = np.random.RandomState(seed)
+    dtypes = [bool, float] * (ncols + 1)
+    columns = [
+        state.random(nrows) < 0.5 if dtype is bool else state.random(nrows)
+        for dtype in dtypes
+    ]
+    store = ColumnStore.empty(dtypes, nrows)
+    for j, column in enumerate(columns):
+        store.set_column(j, column)
+
+    rows = state.choice(nrows, size=nrows // 2 + 1)
+    for j, column in enumerate(columns):
+        assert store.is_packed(j) is (column.dtype == bool)
+        assert np.array_equal(store.column(j), column)
+        assert np.array_equal(store.take(j, rows), column[rows])
+
+    child = ColumnStore.empty([None] * len(dtypes), nrows)
+    child.link(0, store, 0)
+    assert child.is_packed(0)
+
+    child.update(0, [0], [not columns[0][0]])
+    assert child.column(0)[0] != columns[0][0]
+    assert np.array_equal(store.column(0), columns[0])
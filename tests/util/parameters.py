@@ -126,6 +126,20 @@ TUPLE_MUTATION = given(
     row_limits=SHAPES, col_limits=TUPLES, weights=WEIGHTS, prob=PROB, seed=INTS
 )
 
+SPARSE_MUTATION = given(
+    row_limits=SHAPES,
+    col_limits=SHAPES,
+    weights=WEIGHTS,
+    prob=SMALL_PROB,
+    seed=INTS,
+)
+
+SPARSE_CELLS = given(
+    ncells=integers(min_value=0, max_value=10000),
+    prob=SMALL_PROB,
+    seed=INTS,
+)
+
 OFFSPRING = given(
     size=SIZE,
     row_limits=SHAPES,